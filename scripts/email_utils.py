@@ -1,7 +1,8 @@
 import smtplib
 import ssl
+from contextlib import contextmanager
 from email.message import EmailMessage
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator
 from html import escape as html_escape
 
 
@@ -37,6 +38,57 @@ def _build_email_message(
     return msg
 
 
+@contextmanager
+def smtp_session(
+    smtp_host: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+) -> Iterator[smtplib.SMTP]:
+    """
+    Open one authenticated SMTP connection, STARTTLS (587) or implicit SSL
+    (465), for sending any number of messages. The TLS handshake and login
+    happen once; the connection is closed with QUIT on exit.
+    """
+    context = ssl.create_default_context()
+    if int(smtp_port) == 465:
+        server = smtplib.SMTP_SSL(smtp_host, int(smtp_port), timeout=60, context=context)
+    else:
+        server = smtplib.SMTP(smtp_host, int(smtp_port), timeout=60)
+    try:
+        if not isinstance(server, smtplib.SMTP_SSL):
+            server.starttls(context=context)
+        server.login(smtp_user, smtp_password)
+        yield server
+    finally:
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            server.close()
+
+
+def send_messages(
+    messages: Iterable[EmailMessage],
+    smtp_host: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+) -> None:
+    """
+    Send several prepared messages over a single SMTP session.
+    """
+    try:
+        with smtp_session(smtp_host, smtp_port, smtp_user, smtp_password) as server:
+            for msg in messages:
+                server.send_message(msg)
+    except smtplib.SMTPResponseException as ex:
+        code = getattr(ex, "smtp_code", None)
+        err = getattr(ex, "smtp_error", b"").decode("utf-8", "ignore")
+        raise RuntimeError(f"SMTPResponseException {code}: {err}") from ex
+    except Exception as ex:
+        raise RuntimeError(f"SMTP send failed: {ex}") from ex
+
+
 def send_email(
     subject: str,
     html_body: str,
@@ -54,26 +106,33 @@ def send_email(
     """
     msg = _build_email_message(subject, html_body, to_addr, from_addr, reply_to=reply_to)
     eml_bytes = msg.as_bytes()
+    send_messages([msg], smtp_host, smtp_port, smtp_user, smtp_password)
+    return eml_bytes
 
-    context = ssl.create_default_context()
-    try:
-        if int(smtp_port) == 465:
-            with smtplib.SMTP_SSL(smtp_host, int(smtp_port), timeout=60, context=context) as server:
-                server.login(smtp_user, smtp_password)
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(smtp_host, int(smtp_port), timeout=60) as server:
-                server.starttls(context=context)
-                server.login(smtp_user, smtp_password)
-                server.send_message(msg)
-    except smtplib.SMTPResponseException as ex:
-        code = getattr(ex, "smtp_code", None)
-        err = getattr(ex, "smtp_error", b"").decode("utf-8", "ignore")
-        raise RuntimeError(f"SMTPResponseException {code}: {err}") from ex
-    except Exception as ex:
-        raise RuntimeError(f"SMTP send failed: {ex}") from ex
 
-    return eml_bytes
+def _render_result_item(r: Dict) -> str:
+    url_esc = html_escape(r.get("url") or "")
+    title_esc = html_escape(r.get("title") or "Meeting Item")
+    date_val = r.get("date") or ""
+    date_html = f"<p><strong>Date:</strong> {html_escape(date_val)}</p>" if date_val else ""
+
+    mentions_html = "".join(
+        f"<li><strong>{html_escape(m.get('keyword', ''))}</strong>: {html_escape(m.get('snippet', ''))}</li>"
+        for m in (r.get("mentions") or [])
+    )
+    if mentions_html:
+        mentions_html = "<ul>" + mentions_html + "</ul>"
+
+    return (
+        "<li style=\"margin-bottom: 20px;\">"
+        f"<p><strong>Title:</strong> {title_esc}</p>"
+        f"{date_html}"
+        "<p><strong>URL:</strong> "
+        f"<a href=\"{url_esc}\" target=\"_blank\" rel=\"noopener noreferrer\">{url_esc}</a>"
+        "</p>"
+        f"{mentions_html}"
+        "</li>"
+    )
 
 
 def render_html_report(results: List[Dict]) -> str:
@@ -83,35 +142,7 @@ def render_html_report(results: List[Dict]) -> str:
     if not results:
         body_html = "<p>No preschool-related mentions were found in this period’s BOE minutes.</p>"
     else:
-        items: List[str] = []
-        for r in results:
-            url = r.get("url") or ""
-            title = r.get("title") or "Meeting Item"
-            date_val = r.get("date") or ""
-
-            url_esc = html_escape(url)
-            title_esc = html_escape(title)
-            date_html = f"<p><strong>Date:</strong> {html_escape(date_val)}</p>" if date_val else ""
-
-            mention_li: List[str] = []
-            for m in (r.get("mentions") or []):
-                kw = html_escape(m.get("keyword", ""))
-                snip = html_escape(m.get("snippet", ""))
-                mention_li.append(f"<li><strong>{kw}</strong>: {snip}</li>")
-            mentions_html = "<ul>" + "".join(mention_li) + "</ul>" if mention_li else ""
-
-            items.append(
-                "<li style=\"margin-bottom: 20px;\">"
-                f"<p><strong>Title:</strong> {title_esc}</p>"
-                f"{date_html}"
-                "<p><strong>URL:</strong> "
-                f"<a href=\"{url_esc}\" target=\"_blank\" rel=\"noopener noreferrer\">{url_esc}</a>"
-                "</p>"
-                f"{mentions_html}"
-                "</li>"
-            )
-
-        body_html = "<ol>" + "".join(items) + "</ol>"
+        body_html = "<ol>" + "".join(_render_result_item(r) for r in results) + "</ol>"
 
     html = (
         "<!DOCTYPE html>"
@@ -1,12 +1,29 @@
 import re
+import threading
 from io import BytesIO
-from typing import List, Dict, Optional, Iterable, Tuple
-from datetime import datetime, date
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple, Union, IO
+from datetime import datetime, date, timezone
 
 from PyPDF2 import PdfReader
 from docx import Document
 from dateutil import parser as dateparser
 
+# Faster PDF engines, used when installed; PyPDF2 stays as the last resort
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Neither PDFium nor MuPDF is thread-safe, and documents are extracted on the
+# scraper's worker pool. Every call into them holds this lock (one page at a
+# time, so other threads interleave); reentrant in case a finalizer closing
+# an abandoned document runs while the same thread already holds it.
+_NATIVE_PDF_LOCK = threading.RLock()
+
 # --------------------------------------------------------------------
 # Keyword patterns (expanded)
 # --------------------------------------------------------------------
@@ -114,30 +131,105 @@ def _bounded_context(text: str, match_span: Tuple[int, int], target_len: int = 2
 # PDF & DOCX text extraction
 # --------------------------------------------------------------------
 
-def extract_text_from_pdf(content: bytes) -> str:
+def _as_stream(content: Union[bytes, IO[bytes]]) -> IO[bytes]:
     """
-    Extract text from every PDF page, skipping unreadable pages.
+    Accept raw bytes or an already-open seekable binary file.
     """
+    if isinstance(content, (bytes, bytearray)):
+        return BytesIO(content)
+    return content
+
+def _fitz_pages(stream: IO[bytes]) -> Iterator[str]:
+    data = stream.read()
+    with _NATIVE_PDF_LOCK:
+        doc = fitz.open(stream=data, filetype="pdf")
+        count = doc.page_count
+    try:
+        for i in range(count):
+            with _NATIVE_PDF_LOCK:
+                try:
+                    txt = doc.load_page(i).get_text("text") or ""
+                except Exception:
+                    txt = ""
+            yield txt
+    finally:
+        with _NATIVE_PDF_LOCK:
+            doc.close()
+
+def _pdfium_page_text(pdf, index: int) -> str:
     try:
-        reader = PdfReader(BytesIO(content))
+        page = pdf[index]
     except Exception:
         return ""
-    texts: List[str] = []
-    for page in getattr(reader, "pages", []):
+    try:
+        textpage = page.get_textpage()
         try:
-            txt = page.extract_text() or ""
+            return textpage.get_text_bounded() or ""
+        finally:
+            textpage.close()
+    except Exception:
+        return ""
+    finally:
+        page.close()
+
+def _pdfium_pages(stream: IO[bytes]) -> Iterator[str]:
+    data = stream.read()
+    with _NATIVE_PDF_LOCK:
+        pdf = pdfium.PdfDocument(data)
+        count = len(pdf)
+    try:
+        for i in range(count):
+            with _NATIVE_PDF_LOCK:
+                txt = _pdfium_page_text(pdf, i)
+            yield txt
+    finally:
+        with _NATIVE_PDF_LOCK:
+            pdf.close()
+
+def _pypdf2_pages(stream: IO[bytes]) -> Iterator[str]:
+    for page in PdfReader(stream).pages:
+        try:
+            yield page.extract_text() or ""
         except Exception:
-            txt = ""
-        if txt:
-            texts.append(txt)
-    return "\n".join(texts)
+            yield ""
+
+_PDF_ENGINES = tuple(engine for engine, available in (
+    (_fitz_pages, fitz is not None),
+    (_pdfium_pages, pdfium is not None),
+    (_pypdf2_pages, True),
+) if available)
 
-def extract_text_from_docx(content: bytes) -> str:
+def extract_text_from_pdf_pages(content: Union[bytes, IO[bytes]]) -> Iterator[str]:
+    """
+    Yield each page's text using the first engine that can open the file
+    (PyMuPDF, then pypdfium2, then PyPDF2). Unreadable pages yield "".
+    """
+    stream = _as_stream(content)
+    for engine in _PDF_ENGINES:
+        stream.seek(0)
+        pages = engine(stream)
+        try:
+            first = next(pages)
+        except StopIteration:
+            return
+        except Exception:
+            continue
+        yield first
+        yield from pages
+        return
+
+def extract_text_from_pdf(content: Union[bytes, IO[bytes]]) -> str:
+    """
+    Extract text from every PDF page, skipping unreadable pages.
+    """
+    return "\n".join(txt for txt in extract_text_from_pdf_pages(content) if txt)
+
+def extract_text_from_docx(content: Union[bytes, IO[bytes]]) -> str:
     """
     Extract text from .docx paragraphs safely.
     """
     try:
-        doc = Document(BytesIO(content))
+        doc = Document(_as_stream(content))
     except Exception:
         return ""
     return "\n".join(_normalize_space(p.text) for p in doc.paragraphs if p.text)
@@ -193,14 +285,54 @@ DATE_HINT_WINDOW_RE = re.compile(
     re.IGNORECASE
 )
 
-def _parse_candidates_from_text(source: str) -> List[datetime]:
+# Fast paths for the token shapes DATE_REGEXES produce; dateutil is only
+# consulted for anything these don't cover.
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+_MONTH_NAME_TOKEN_RE = re.compile(r"([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{1,2}),\s+(\d{4})")
+_MDY_TOKEN_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2}|\d{4})")
+# Year-month-day only with one repeated separator or exactly 8 digits;
+# "202311" or "2023125" are ambiguous and are left to dateutil
+_YMD_TOKEN_RE = re.compile(
+    r"(20\d{2})([-_/])(0?[1-9]|1[0-2])\2(0?[1-9]|[12]\d|3[01])"
+    r"|(20\d{2})(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])"
+)
+
+def _fast_parse_date(token: str) -> Optional[datetime]:
+    try:
+        m = _MONTH_NAME_TOKEN_RE.fullmatch(token)
+        if m:
+            month = _MONTHS.get(m.group(1).lower())
+            if month:
+                return datetime(int(m.group(3)), month, int(m.group(2)))
+        m = _MDY_TOKEN_RE.fullmatch(token)
+        if m:
+            year = int(m.group(3))
+            if year < 100:
+                year += 2000 if year < 70 else 1900
+            return datetime(year, int(m.group(1)), int(m.group(2)))
+        m = _YMD_TOKEN_RE.fullmatch(token)
+        if m:
+            if m.group(1):
+                return datetime(int(m.group(1)), int(m.group(3)), int(m.group(4)))
+            return datetime(int(m.group(5)), int(m.group(6)), int(m.group(7)))
+    except ValueError:
+        pass
+    return None
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+def _parse_candidates_from_text(source: str, max_year: Optional[int] = None) -> List[datetime]:
+    if max_year is None:
+        max_year = _utc_today().year + 1
     cands: List[datetime] = []
     for rx in DATE_REGEXES:
         for m in rx.finditer(source or ""):
             token = m.group(0)
             try:
-                dt = dateparser.parse(token, dayfirst=False, fuzzy=True)
-                if 2015 <= dt.year <= datetime.utcnow().year + 1:
+                dt = _fast_parse_date(token) or dateparser.parse(token, dayfirst=False, fuzzy=True)
+                if 2015 <= dt.year <= max_year:
                     cands.append(dt)
             except Exception:
                 continue
@@ -218,14 +350,30 @@ def _score_date(dt: datetime, *, origin: str, today: date) -> float:
     score += min(age_days / 365.0, 10.0)
     return score
 
-def _best_candidate(cands: List[Tuple[datetime, str]]) -> Optional[datetime]:
+def _best_candidate(cands: List[Tuple[datetime, str]], today: Optional[date] = None) -> Optional[datetime]:
     if not cands:
         return None
-    today = datetime.utcnow().date()
+    if today is None:
+        today = _utc_today()
     ranked = [(dt, _score_date(dt, origin=o, today=today)) for dt, o in cands]
     ranked.sort(key=lambda x: (x[1], -x[0].timestamp()))
     return ranked[0][0] if ranked else None
 
+def _title_url_candidates(title: str, url: str, max_year: int) -> List[Tuple[datetime, str]]:
+    candidates: List[Tuple[datetime, str]] = []
+    for origin, chunk in (("title", title or ""), ("url", url or "")):
+        for dt in _parse_candidates_from_text(chunk, max_year):
+            candidates.append((dt, origin))
+    return candidates
+
+def guess_date_from_url_or_title(url: str, title: str = "") -> Optional[datetime]:
+    """
+    Date from the link alone (no download), for filtering before a fetch.
+    None when neither the title nor the URL carries an explicit date.
+    """
+    today = _utc_today()
+    return _best_candidate(_title_url_candidates(title, url, today.year + 1), today)
+
 def guess_meeting_date(text: str, title: str = "", url: str = "") -> Optional[datetime]:
     """
     Multi-source date inference:
@@ -233,11 +381,9 @@ def guess_meeting_date(text: str, title: str = "", url: str = "") -> Optional[da
       - text windows around BOE-related hint phrases
       - global text fallback
     """
-    candidates: List[Tuple[datetime, str]] = []
-
-    for origin, chunk in (("title", title or ""), ("url", url or "")):
-        for dt in _parse_candidates_from_text(chunk):
-            candidates.append((dt, origin))
+    today = _utc_today()
+    max_year = today.year + 1
+    candidates = _title_url_candidates(title, url, max_year)
 
     if text:
         tnorm = _normalize_space(text)
@@ -245,11 +391,11 @@ def guess_meeting_date(text: str, title: str = "", url: str = "") -> Optional[da
             start = max(0, m.start() - 200)
             end = min(len(tnorm), m.end() + 200)
             window = tnorm[start:end]
-            for dt in _parse_candidates_from_text(window):
+            for dt in _parse_candidates_from_text(window, max_year):
                 candidates.append((dt, "hint-window"))
 
     if not candidates and text:
-        for dt in _parse_candidates_from_text(text):
+        for dt in _parse_candidates_from_text(text, max_year):
             candidates.append((dt, "body"))
 
-    return _best_candidate(candidates)
+    return _best_candidate(candidates, today)
@@ -1,23 +1,43 @@
 # Delran BOE Preschool Monitor – Scraper
 import os
 import re
+import atexit
 import csv
 import json
 import time
 import hashlib
+import functools
+import itertools
 import logging
-from typing import List, Dict, Optional, Tuple, Iterable, Set
-from urllib.parse import urljoin, urlparse
-from datetime import datetime
+import socket
+import sys
+import tempfile
+import threading
+import urllib.robotparser
+from collections import deque
+from queue import SimpleQueue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple, Iterable, Iterator, Set, FrozenSet, Deque, IO
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+from datetime import datetime, timezone
+from io import BytesIO
+from email.message import EmailMessage
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
 import html as _html
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import stealth
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json reads/writes the same state file
+    orjson = None
+
 # Import utils
-from parser_utils import extract_text_from_pdf, extract_text_from_docx, find_preschool_mentions, guess_meeting_date, KEYWORD_REGEX
+from parser_utils import extract_text_from_pdf, extract_text_from_pdf_pages, extract_text_from_docx, find_preschool_mentions, guess_meeting_date, guess_date_from_url_or_title, KEYWORD_REGEX
 from email_utils import render_html_report, send_email
 
 # --------------------------- Configuration ---------------------------
@@ -27,20 +47,47 @@ BOE_URL = os.environ.get("DELRAN_BOE_URL", "https://www.delranschools.org/b_o_e"
 BOARDDOCS_PUBLIC = os.environ.get("BOARDDOCS_PUBLIC_URL", "https://go.boarddocs.com/nj/delranschools/Board.nsf/Public")
 
 STATE_FILE = os.environ.get("STATE_FILE", "state.json")
+# Checkpoints append only what changed to this JSONL file; the end-of-run
+# save folds it into STATE_FILE and removes it
+STATE_JOURNAL = STATE_FILE + ".journal"
+PARSED_CACHE_DIR = os.environ.get("PARSED_CACHE_DIR", ".parsed_cache")  # extracted PDF/DOCX text; "" disables
+PARSED_CACHE_DAYS = int(os.environ.get("PARSED_CACHE_DAYS", "120"))  # prune entries unused this long
 DEBUG_SAVE_HTML = os.environ.get("DEBUG_SAVE_HTML", "1") == "1"
 FORCE_FULL_RESCAN = os.environ.get("FORCE_FULL_RESCAN", "0") == "1"
+DNS_CACHE = os.environ.get("DNS_CACHE", "0") == "1"  # opt-in; see install_dns_cache
+DNS_CACHE_TTL = int(os.environ.get("DNS_CACHE_TTL", "300"))  # seconds
+PW_BLOCK_RESOURCES = os.environ.get("PW_BLOCK_RESOURCES", "1") == "1"
+PW_WORKERS = int(os.environ.get("PW_WORKERS", "3"))  # concurrent Playwright browsers
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
+    # requests decodes these transparently; "br" would need the brotli package
+    "Accept-Encoding": "gzip, deflate",
     "Cache-Control": "no-cache",
     "Pragma": "no-cache",
 }
 
 DOC_DELAY_SECONDS = float(os.environ.get("DOC_DELAY_SECONDS", "2.0"))
+RESPECT_ROBOTS = os.environ.get("RESPECT_ROBOTS", "1") == "1"
+DOC_WORKERS = int(os.environ.get("DOC_WORKERS", "8"))
 REQUEST_TIMEOUT = int(os.environ.get("REQUEST_TIMEOUT", "60"))
 MAX_BOARDDOCS_FILES = int(os.environ.get("MAX_BOARDDOCS_FILES", "50"))
+MAX_BOARDDOCS_PAGES = int(os.environ.get("MAX_BOARDDOCS_PAGES", "30"))
+BOARDDOCS_FRONTIER_CAP = int(os.environ.get("BOARDDOCS_FRONTIER_CAP", "64"))  # max URLs waiting in the BoardDocs crawl queue
+MAX_SEEN_HASHES = int(os.environ.get("MAX_SEEN_HASHES", "50000"))
+CHECKPOINT_EVERY = int(os.environ.get("CHECKPOINT_EVERY", "25"))  # save state every N documents; 0 = only at the end
+
+# Downloaded documents stay in memory up to this size, then spill to disk
+# (per worker, so peak RSS is roughly DOC_WORKERS times this)
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+# Larger documents (usually full board packets) are skipped; 0 disables the cap
+MAX_DOC_BYTES = int(os.environ.get("MAX_DOC_BYTES", str(75 * 1024 * 1024)))
+CSV_BUFFER_BYTES = 1024 * 1024  # report/scanned CSVs are flushed in 1 MiB writes
+# Stop reading a PDF after this many pages without a keyword hit; a mention
+# past that point is missed, so 0 (read every page) is the default
+PDF_GIVE_UP_PAGES = int(os.environ.get("PDF_GIVE_UP_PAGES", "0"))
 
 _MIN_YEAR_ENV = os.environ.get("MIN_YEAR")
 MIN_YEAR = int(_MIN_YEAR_ENV) if (_MIN_YEAR_ENV and str(_MIN_YEAR_ENV).isdigit()) else None
@@ -54,19 +101,77 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 MAX_DISTRICT_PAGES = int(os.environ.get("MAX_DISTRICT_PAGES", "50"))
 MAX_CRAWL_DEPTH = int(os.environ.get("MAX_CRAWL_DEPTH", "4"))
+CRAWL_WORKERS = int(os.environ.get("CRAWL_WORKERS", "6"))  # pages fetched concurrently per crawl wave
 
-ALLOWED_DISTRICT_DOMAINS = {
+ALLOWED_DISTRICT_DOMAINS = frozenset({
     "www.delranschools.org",
     "delranschools.org",
     "cdnsm5-ss5.sharpschool.com",
-}
+})
+
+# The Playwright debug log only needs <title>; don't parse the rest of the page
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+# Shared session so repeat requests to the same host reuse keep-alive connections.
+# Unchanged documents are skipped with conditional GETs (see fetch_document),
+# so responses are never cached to disk and bodies can stream.
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+atexit.register(_SESSION.close)
+
+def install_dns_cache() -> Callable[[], None]:
+    """
+    Remember socket.getaddrinfo results for DNS_CACHE_TTL seconds; the run only
+    talks to a couple of hosts, so new pooled connections skip the lookup.
+    This replaces the resolver process-wide, so main() installs it only when
+    DNS_CACHE=1 and calls the returned function to put the original back.
+    Failed lookups raise and are not cached; each caller gets its own list.
+    """
+    original = socket.getaddrinfo
+    cache: Dict[tuple, Tuple[float, list]] = {}
+    lock = threading.Lock()
+
+    def getaddrinfo(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with lock:
+            hit = cache.get(key)
+        if hit is None or now - hit[0] >= DNS_CACHE_TTL:
+            hit = (now, original(*args, **kwargs))
+            with lock:
+                cache[key] = hit
+        return list(hit[1])
+
+    def restore() -> None:
+        socket.getaddrinfo = original
+
+    socket.getaddrinfo = getaddrinfo
+    return restore
 
 # ----------------------------- Helpers ------------------------------
 
 def html_escape(s: str) -> str:
     return _html.escape(s or "", quote=True)
 
+def digest_of(*parts: str) -> str:
+    """
+    128-bit BLAKE2b fingerprint (32 hex chars); faster than SHA-1 and only
+    used for dedupe keys.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        h.update(p.encode("utf-8", "ignore") if p else b"")
+    return h.hexdigest()
+
 def sha1_of(*parts: str) -> str:
+    # Legacy fingerprint (40 hex chars) still present in older state files
     h = hashlib.sha1()
     for p in parts:
         h.update((p or "").encode("utf-8", "ignore"))
@@ -75,91 +180,406 @@ def sha1_of(*parts: str) -> str:
 def ensure_debug_dir() -> None:
     os.makedirs(".debug", exist_ok=True)
 
-def fetch(url: str, referer: Optional[str] = None) -> requests.Response:
-    logging.info(f"Starting fetch for {url}")
-    if "delranschools.org" in url.lower():
-        logging.info("Using stealth Playwright for Delran page")
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    viewport={"width": 1920, "height": 1080},
-                    locale="en-US",
-                    timezone_id="America/New_York",
-                    bypass_csp=True,
-                    ignore_https_errors=True,
-                    java_script_enabled=True,
-                )
-                page = context.new_page()
-                stealth(page)
-                page.set_extra_http_headers(HEADERS)
-                if referer:
-                    page.set_extra_http_headers({"Referer": referer})
-                response = page.goto(url, timeout=90000, wait_until="networkidle")
-                if response is None:
-                    logging.warning("No response from goto")
-                else:
-                    logging.info(f"Playwright response status: {response.status}")
+# Playwright's sync API is bound to the thread that started it, so each slot
+# is a single-thread executor owning its own long-lived browser and context
+# (started on first use). Callers borrow an idle slot, so up to PW_WORKERS
+# pages render at once while every browser call stays on its own thread.
+_PW_SLOTS: List[Tuple[ThreadPoolExecutor, Dict[str, object]]] = [
+    (ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"playwright-{i}"), {})
+    for i in range(max(1, PW_WORKERS))
+]
+_PW_IDLE: "SimpleQueue[int]" = SimpleQueue()
+for _i in range(len(_PW_SLOTS)):
+    _PW_IDLE.put(_i)
+
+# Only the DOM matters for link discovery. Stylesheets are left alone so the
+# pop-up close button is hit-tested against the real layout.
+_PW_BLOCKED_TYPES = frozenset({"image", "font", "media"})
+_PW_BLOCKED_HOSTS_RE = re.compile(
+    r"(^|\.)(google-analytics\.com|googletagmanager\.com|doubleclick\.net|facebook\.net|hotjar\.com)$"
+)
+
+# Delran index pages whose document lists need JS; other delranschools.org
+# URLs (leaf pages, GetFile.ashx documents) try plain requests first
+_PW_PATHS = frozenset(urlparse(u).path.rstrip("/") for u in (BASE_URL, BOE_URL))
+# One pass for is_document_url: a .pdf/.doc/.docx path (before any query or
+# fragment) or one of the district / BoardDocs file handlers
+_DOCUMENT_URL_RE = re.compile(
+    r"\.(?:pdf|docx?)(?:[?#]|$)|getfile\.ashx|displayfile\.aspx|/Board\.nsf/files/[A-Za-z0-9]+/(?:download|view)",
+    re.IGNORECASE,
+)
+_CHALLENGE_RE = re.compile(rb"checking your browser|cf-chl|just a moment\.\.\.", re.IGNORECASE)
+
+# A rendered minutes/BOE page has at least one of these document links
+_PW_READY_SELECTOR = (
+    "a[href*='getfile.ashx' i], a[href*='displayfile.aspx' i], "
+    "a[href*='Board.nsf' i], a[href$='.pdf' i]"
+)
+_PW_POPUP_CLOSE_SELECTOR = (
+    'button[aria-label="close"], button.close, [class*="close"], [id*="close"], '
+    '[title="Close"], .alert-dismissible button'
+)
+
+def _pw_route(route) -> None:
+    request = route.request
+    if request.resource_type in _PW_BLOCKED_TYPES or _PW_BLOCKED_HOSTS_RE.search(domain_of(request.url)):
+        route.abort()
+    else:
+        route.continue_()
 
-                # Attempt to close alert pop-up
-                try:
-                    page.wait_for_timeout(5000)
-                    page.click('button[aria-label="close"], button.close, [class*="close"], [id*="close"], [title="Close"], .alert-dismissible button', timeout=10000)
-                    logging.info("Attempted to close alert pop-up")
-                except Exception as e:
-                    logging.info(f"No pop-up close button found or failed to click: {e}")
-
-                page.wait_for_timeout(8000)
-                html = page.content()
-                browser.close()
-
-                logging.info(f"Stealth Playwright fetch success: {len(html)} bytes")
-
-                # Debug what was fetched
-                logging.info(f"Contains 'GetFile.ashx': {'getfile.ashx' in html.lower()}")
-                logging.info(f"Contains 'Minutes': {'minutes' in html.lower()}")
-                logging.info(f"Contains 'Cloudflare' or 'checking your browser': {'cloudflare' in html.lower() or 'checking your browser' in html.lower()}")
-                cleaned = html[:300].replace("\n", " ").replace("\r", " ")
-                logging.info(f"First 300 chars of HTML (cleaned): {cleaned}")
-                soup = BeautifulSoup(html, "lxml")
-                logging.info(f"Page title: {soup.title.string if soup.title else 'No title'}")
-
-                class FakeResponse:
-                    def __init__(self, text):
-                        self.text = text
-                        self.content = text.encode('utf-8')
-                        self.status_code = 200 if len(text) > 5000 else 403
-                    def raise_for_status(self):
-                        if self.status_code != 200:
-                            raise requests.exceptions.HTTPError(f"Status {self.status_code}")
-                return FakeResponse(html)
-        except Exception as e:
-            logging.error(f"Stealth Playwright fetch failed: {str(e)}")
+def _pw_run(fn, *args):
+    """Run fn(slot_state, *args) on an idle Playwright slot's thread and wait."""
+    i = _PW_IDLE.get()
+    try:
+        executor, state = _PW_SLOTS[i]
+        return executor.submit(fn, state, *args).result()
+    finally:
+        _PW_IDLE.put(i)
+
+def _pw_context(state: Dict[str, object]):
+    if "context" not in state:
+        pw = sync_playwright().start()
+        try:
+            browser = pw.chromium.launch(headless=True)
+            context = browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                viewport={"width": 1920, "height": 1080},
+                locale="en-US",
+                timezone_id="America/New_York",
+                bypass_csp=True,
+                ignore_https_errors=True,
+                java_script_enabled=True,
+            )
+            if PW_BLOCK_RESOURCES:
+                context.route("**/*", _pw_route)
+        except Exception:
+            pw.stop()
             raise
-    else:
-        headers = dict(HEADERS)
+        state.update(pw=pw, browser=browser, context=context)
+        logging.info("Started Playwright browser on %s", threading.current_thread().name)
+    return state["context"]
+
+def _close_pw(state: Dict[str, object]) -> None:
+    browser, pw = state.get("browser"), state.get("pw")
+    state.clear()
+    try:
+        if browser is not None:
+            browser.close()
+    finally:
+        if pw is not None:
+            pw.stop()
+
+def close_browser() -> None:
+    """Shut down every Playwright browser that was started."""
+    for executor, state in _PW_SLOTS:
+        if state:
+            try:
+                executor.submit(_close_pw, state).result(timeout=60)
+            except Exception as e:
+                logging.warning("Playwright shutdown failed: %s", e)
+
+def _playwright_html(state: Dict[str, object], url: str, referer: Optional[str]) -> str:
+    page = _pw_context(state).new_page()
+    try:
+        stealth(page)
+        page.set_extra_http_headers(HEADERS)
         if referer:
-            headers["Referer"] = referer
-        logging.info(f"Using requests for {url}")
-        resp = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            page.set_extra_http_headers({"Referer": referer})
+        response = page.goto(url, timeout=30000, wait_until="domcontentloaded")
+        if response is None:
+            logging.warning("No response from goto")
+        else:
+            logging.info(f"Playwright response status: {response.status}")
+
+        # Ready once a document link has rendered; pages without any just
+        # use up the timeout, then get a short bounded network-quiet wait
+        try:
+            page.wait_for_selector(_PW_READY_SELECTOR, timeout=15000)
+        except PlaywrightTimeoutError:
+            logging.info("No document links rendered on %s", url)
+        try:
+            page.wait_for_load_state("networkidle", timeout=5000)
+        except PlaywrightTimeoutError:
+            pass
+
+        # Close the alert pop-up if one is showing; don't wait for one to appear
+        try:
+            close = page.locator(_PW_POPUP_CLOSE_SELECTOR).first
+            if close.is_visible():
+                close.click(timeout=2000)
+                logging.info("Closed alert pop-up")
+        except Exception as e:
+            logging.info(f"No pop-up close button found or failed to click: {e}")
+
+        return page.content()
+    finally:
+        page.close()
+
+def is_delran_url(url: str) -> bool:
+    return "delranschools.org" in domain_of(url)
+
+def needs_browser(url: str) -> bool:
+    """Only the Delran index pages (_PW_PATHS) go straight to Playwright."""
+    return is_delran_url(url) and urlparse(url).path.rstrip("/") in _PW_PATHS
+
+def is_document_url(url: str) -> bool:
+    """PDF/DOCX links and the district/BoardDocs file handlers serve bytes, not pages."""
+    return _DOCUMENT_URL_RE.search(url) is not None
+
+def can_fall_back_to_browser(url: str) -> bool:
+    """A rendered page is no substitute for a binary, so documents never retry in Chromium."""
+    return is_delran_url(url) and not is_document_url(url)
+
+def looks_blocked(resp: requests.Response) -> bool:
+    """
+    A bot-check interstitial rather than the page: an HTML response that is
+    tiny or carries the Cloudflare challenge markers. Documents never match.
+    """
+    if "html" not in resp.headers.get("Content-Type", "").lower():
+        return False
+    return len(resp.content) < 5000 or bool(_CHALLENGE_RE.search(resp.content[:16384]))
+
+class FakeResponse:
+    """
+    requests.Response stand-in for a Playwright-rendered page. Keeps only the
+    UTF-8 bytes (what the parser and the debug dump read); .text is decoded
+    on demand instead of held alongside.
+    """
+    __slots__ = ("content", "headers", "status_code")
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+        self.status_code = 200 if len(content) > 5000 else 403
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code != 200:
+            raise requests.exceptions.HTTPError(f"Status {self.status_code}")
+
+def _fetch_with_playwright(url: str, referer: Optional[str] = None) -> requests.Response:
+    logging.info("Using stealth Playwright for Delran page")
+    try:
+        html = _pw_run(_playwright_html, url, referer)
+
+        logging.info(f"Stealth Playwright fetch success: {len(html)} bytes")
+
+        # Debug what was fetched
+        lowered = html.lower()
+        logging.info(f"Contains 'GetFile.ashx': {'getfile.ashx' in lowered}")
+        logging.info(f"Contains 'Minutes': {'minutes' in lowered}")
+        logging.info(f"Contains 'Cloudflare' or 'checking your browser': {'cloudflare' in lowered or 'checking your browser' in lowered}")
+        del lowered
+        cleaned = html[:300].replace("\n", " ").replace("\r", " ")
+        logging.info(f"First 300 chars of HTML (cleaned): {cleaned}")
+        m = _TITLE_RE.search(html)
+        logging.info(f"Page title: {m.group(1).strip() if m else 'No title'}")
+
+        content = html.encode("utf-8")
+        del html
+        return FakeResponse(content)
+    except Exception as e:
+        logging.error(f"Stealth Playwright fetch failed: {str(e)}")
+        raise
+
+def fetch(url: str, referer: Optional[str] = None) -> requests.Response:
+    """
+    Plain requests for everything except the JS-rendered Delran index pages.
+    Other Delran URLs fall back to Playwright only when requests is refused
+    or gets a bot-check page back.
+    """
+    logging.info(f"Starting fetch for {url}")
+    if needs_browser(url):
+        return _fetch_with_playwright(url, referer)
+
+    logging.info(f"Using requests for {url}")
+    try:
+        resp = _SESSION.get(url, headers={"Referer": referer} if referer else None, timeout=REQUEST_TIMEOUT)
         logging.info(f"requests fetch: status={resp.status_code}, bytes={len(resp.content)}")
         resp.raise_for_status()
-        return resp
-
-def polite_delay() -> None:
-    if DOC_DELAY_SECONDS > 0:
-        time.sleep(DOC_DELAY_SECONDS)
+    except (requests.exceptions.HTTPError, requests.exceptions.RetryError) as e:
+        if not can_fall_back_to_browser(url):
+            raise
+        logging.info("requests refused for %s (%s); retrying with Playwright", url, e)
+        return _fetch_with_playwright(url, referer)
+    if can_fall_back_to_browser(url) and looks_blocked(resp):
+        logging.info("Bot check returned for %s; retrying with Playwright", url)
+        return _fetch_with_playwright(url, referer)
+    return resp
+
+def fetch_document(url: str, validators: Optional[List[str]] = None) -> Tuple[requests.Response, IO[bytes]]:
+    """
+    Download a document body into a SpooledTemporaryFile so multi-MB board
+    packets are streamed to disk instead of held as one bytes object.
+    Returns the response (for headers) and the rewound file; caller closes it.
+
+    `validators` is the [ETag, Last-Modified] pair from a previous run; when
+    given, the request is conditional and a 304 comes back with an empty body.
+    """
+    if needs_browser(url):
+        # Playwright path returns the whole page anyway
+        resp = fetch(url)
+        return resp, BytesIO(resp.content)
+    if can_fall_back_to_browser(url):
+        try:
+            return _stream_document(url, validators)
+        except (requests.exceptions.HTTPError, requests.exceptions.RetryError) as e:
+            logging.info("requests refused for %s (%s); retrying with Playwright", url, e)
+            resp = _fetch_with_playwright(url)
+            return resp, BytesIO(resp.content)
+    return _stream_document(url, validators)
+
+def _stream_document(url: str, validators: Optional[List[str]]) -> Tuple[requests.Response, IO[bytes]]:
+
+    headers = {}
+    if validators:
+        etag, last_modified = validators
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    logging.info(f"Streaming document {url}")
+    buf = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        with _SESSION.get(url, headers=headers or None, stream=True, timeout=REQUEST_TIMEOUT) as resp:
+            resp.raise_for_status()
+            # Headers arrive before the body, so an oversized file is refused
+            # without downloading it; the running total covers missing lengths
+            declared = int(resp.headers.get("Content-Length") or 0)
+            if MAX_DOC_BYTES and declared > MAX_DOC_BYTES:
+                raise ValueError(f"document too large ({declared} bytes > MAX_DOC_BYTES)")
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                buf.write(chunk)
+                if MAX_DOC_BYTES and buf.tell() > MAX_DOC_BYTES:
+                    raise ValueError(f"document too large (over {MAX_DOC_BYTES} bytes)")
+    except Exception:
+        buf.close()
+        raise
+    logging.info(f"Document fetch: status={resp.status_code}, bytes={buf.tell()}")
+    buf.seek(0)
+    return resp, buf
 
+@functools.lru_cache(maxsize=65536)
 def domain_of(url: str) -> str:
     try:
         return urlparse(url).netloc.lower()
     except Exception:
         return ""
 
+# Per-host robots.txt parsers, last-request timestamps and throttle locks
+_ROBOTS: Dict[str, urllib.robotparser.RobotFileParser] = {}
+_ROBOTS_LOCKS: Dict[str, threading.Lock] = {}
+_LAST_HIT: Dict[str, float] = {}
+_HOST_LOCKS: Dict[str, threading.Lock] = {}
+
+def robots_for(host: str) -> urllib.robotparser.RobotFileParser:
+    rp = _ROBOTS.get(host)
+    if rp is not None:
+        return rp
+    # Per-host lock: one fetch per host, and a slow robots.txt only holds up
+    # workers waiting on that same host
+    with _ROBOTS_LOCKS.setdefault(host, threading.Lock()):
+        rp = _ROBOTS.get(host)
+        if rp is None:
+            rp = urllib.robotparser.RobotFileParser()
+            robots_url = f"https://{host}/robots.txt"
+            rp.set_url(robots_url)
+            try:
+                resp = _SESSION.get(robots_url, timeout=REQUEST_TIMEOUT)
+                if resp.status_code == 200:
+                    rp.parse(resp.text.splitlines())
+                else:
+                    rp.allow_all = True
+            except Exception as e:
+                logging.info("robots.txt unavailable for %s: %s", host, e)
+                rp.allow_all = True
+            _ROBOTS[host] = rp
+        return rp
+
+def can_fetch(url: str) -> bool:
+    if not RESPECT_ROBOTS:
+        return True
+    return robots_for(domain_of(url)).can_fetch(HEADERS["User-Agent"], url)
+
+def polite_delay(url: str) -> None:
+    """
+    Wait until DOC_DELAY_SECONDS (or the host's robots.txt Crawl-delay, if
+    larger) has passed since the previous request to the same host.
+
+    Thread-safe: requests to the same host queue up behind one another,
+    requests to different hosts never wait on each other.
+    """
+    host = domain_of(url)
+    delay = DOC_DELAY_SECONDS
+    if RESPECT_ROBOTS:
+        crawl_delay = robots_for(host).crawl_delay(HEADERS["User-Agent"])
+        if crawl_delay:
+            delay = max(delay, float(crawl_delay))
+    with _HOST_LOCKS.setdefault(host, threading.Lock()):
+        wait = _LAST_HIT.get(host, 0.0) + delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _LAST_HIT[host] = time.monotonic()
+
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+@functools.lru_cache(maxsize=4096)
+def canonical_url(url: str) -> str:
+    """
+    Dedupe key for a URL: lowercased scheme/host, default port and fragment
+    dropped, empty query params removed and the rest sorted. Discovery keeps
+    the original URL for fetching and only compares these keys.
+    """
+    p = urlparse(url)
+    scheme = p.scheme.lower()
+    netloc = p.netloc.lower()
+    port = _DEFAULT_PORTS.get(scheme)
+    if port and netloc.endswith(port):
+        netloc = netloc[: -len(port)]
+    query = urlencode(sorted(parse_qsl(p.query)))
+    return urlunparse((scheme, netloc, p.path or "/", p.params, query, ""))
+
+@functools.lru_cache(maxsize=4096)
+def doc_kind(url: str) -> Optional[str]:
+    """
+    "pdf", "docx" or "html" for a document URL, None if unsupported. Cached:
+    the same URLs are classified on every page and again when processed.
+    """
+    path = urlparse(url).path.lower()
+    ext = path.rsplit(".", 1)[-1] if "." in path else ""
+    if ext == "pdf":
+        return "pdf"
+    if ext in ("docx", "doc"):
+        return "docx"
+    if ext in ("htm", "html") or _DISTRICT_FILE_RE.search(path):
+        return "html"
+    return None
+
+@functools.lru_cache(maxsize=16)
+def _subdomain_suffixes(allowed: FrozenSet[str]) -> Tuple[str, ...]:
+    return tuple("." + a for a in allowed)
+
 def is_allowed_domain(url: str, allowed: Set[str]) -> bool:
+    if not isinstance(allowed, frozenset):
+        allowed = frozenset(allowed)
     d = domain_of(url)
-    return any((d == a) or d.endswith("." + a) for a in allowed)
+    return d in allowed or d.endswith(_subdomain_suffixes(allowed))
+
+_CHARSET_RE = re.compile(r"charset=([\w\-]+)", re.IGNORECASE)
+
+def declared_encoding(resp) -> Optional[str]:
+    """
+    Charset from the Content-Type header, if the server sent one. Passing it
+    to lxml's parser skips encoding sniffing; otherwise libxml2 falls back to
+    the page's <meta charset>.
+    """
+    ctype = (getattr(resp, "headers", None) or {}).get("Content-Type", "")
+    m = _CHARSET_RE.search(ctype)
+    return m.group(1) if m else None
 
 def save_debug_html(name: str, content: bytes) -> None:
     if not DEBUG_SAVE_HTML:
@@ -176,241 +596,761 @@ def save_debug_html(name: str, content: bytes) -> None:
 
 DOC_EXTS = (".pdf", ".docx", ".doc", ".htm", ".html")
 
+class LinkItem(NamedTuple):
+    """A discovered document link; a tuple instead of a dict per link."""
+    title: str
+    url: str
+    source: str
+
 BOARD_DOCS_FILE_RE = re.compile(r"/Board\.nsf/files/([A-Za-z0-9]+)/(?:(?:download)|(?:view))", re.IGNORECASE)
-BOARD_DOCS_JSON_URL_RE = re.compile(r'"downloadUrl"\s*:\s*"([^"]+/Board\.nsf/files/[^"]+?)"', re.IGNORECASE)
-BOARD_DOCS_JSON_NAME_RE = re.compile(r'"fileName"\s*:\s*"([^"]+?)"', re.IGNORECASE)
+# One scan over embedded BoardDocs JSON: downloadUrl / fileName values plus the
+# braces that delimit each file object, so a URL is paired with its own name
+BOARD_DOCS_JSON_TOKEN_RE = re.compile(
+    r'"downloadUrl"\s*:\s*"(?P<url>[^"]+/Board\.nsf/files/[^"]+?)"'
+    r'|"fileName"\s*:\s*"(?P<name>[^"]+?)"'
+    r'|[{}]',
+    re.IGNORECASE,
+)
+# Cheap pre-check so scripts with no BoardDocs file URLs (analytics, menus)
+# skip the token scan, which would otherwise stop on every brace
+_BOARD_DOCS_JSON_HINT_RE = re.compile(r"/Board\.nsf/files/", re.IGNORECASE)
+
+# Link classifiers, compiled once; re.IGNORECASE avoids lowercasing every URL/title
+_DISTRICT_FILE_RE = re.compile(r"getfile\.ashx|displayfile\.aspx", re.IGNORECASE)
+_MEETING_TITLE_RE = re.compile(r"minutes|agenda|boe|board|reorganization|re-organ|session|meeting", re.IGNORECASE)
+_BOARDDOCS_NAV_RE = re.compile(r"https://go\.boarddocs\.com/")
+_RELATED_LINK_RE = re.compile(r"minutes|boe|board|meeting|agenda|getfile|displayfile", re.IGNORECASE)
+_PAGINATION_TEXT_RE = re.compile(r'(next|>|»|more|\.{3}|page\s*\d+|pg=|p=)', re.IGNORECASE)
+_PAGINATION_HREF_RE = re.compile(r'(page|pg|p)=', re.IGNORECASE)
+# In-page fragments and non-HTTP schemes never lead to a document
+_NON_PAGE_HREF_RE = re.compile(r"\s*(?:#|mailto:|javascript:|tel:)", re.IGNORECASE)
+
+# Link discovery only needs anchors and scripts, so it walks the lxml tree
+# directly instead of building a BeautifulSoup wrapper around every node.
+_A_XPATH = etree.XPath("//a[@href]")
+_SCRIPT_TEXT_XPATH = etree.XPath("//script/text()")
+# District pages: document links sit in the page body, not the site chrome.
+# Skipping nav/header/footer anchors drops the menu links repeated on every page.
+_CONTENT_A_XPATH = etree.XPath("//a[@href][not(ancestor::nav or ancestor::header or ancestor::footer)]")
+# Visible text nodes for HTML documents (comments aren't text() nodes)
+_BODY_TEXT_XPATH = etree.XPath("//text()[not(ancestor::script or ancestor::style)]")
+
+def parse_html(html: bytes, encoding: Optional[str] = None) -> Optional[lxml_html.HtmlElement]:
+    """
+    Parse page bytes with lxml. Returns None for empty or unparseable markup.
+    """
+    if not html:
+        return None
+    parser = None
+    if encoding:
+        try:
+            parser = lxml_html.HTMLParser(encoding=encoding)
+        except LookupError:
+            parser = None
+    try:
+        return lxml_html.document_fromstring(html, parser=parser)
+    except (etree.ParserError, ValueError) as e:
+        logging.warning("Could not parse HTML: %s", e)
+        return None
 
-def collect_links_from_html(page_url: str, html_text: str) -> List[Dict[str, str]]:
-    soup = BeautifulSoup(html_text, "lxml")
-    items: List[Dict[str, str]] = []
+def anchor_text(a: lxml_html.HtmlElement) -> str:
+    # Same as BeautifulSoup's get_text(strip=True): each text node stripped,
+    # then joined with no separator. The title feeds the seen fingerprint, so
+    # changing this would make every already-reported link look new again.
+    return "".join(t.strip() for t in a.itertext())
+
+def row_context(a: lxml_html.HtmlElement) -> str:
+    """
+    Text of the table row or list item holding an anchor, for listings where
+    the link itself just says "Download" and the meeting name is beside it.
+    """
+    for anc in a.iterancestors("tr", "li"):
+        return " ".join(" ".join(anc.itertext()).split())
+    return ""
+
+def collect_links_from_html(page_url: str, html: bytes, encoding: Optional[str] = None,
+                            anchors_xpath: Optional[etree.XPath] = None) -> List[LinkItem]:
+    return collect_links_from_tree(page_url, parse_html(html, encoding), anchors_xpath)
+
+def boarddocs_json_files(script: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield (downloadUrl, fileName) pairs from a script body in one pass. Each
+    URL takes the fileName from the same {...} object, in either key order;
+    nested objects get their own slot, so they don't split the pair.
+    """
+    if not _BOARD_DOCS_JSON_HINT_RE.search(script):
+        return
+    # One [url, name] slot per open brace; the bottom one is top-level
+    stack: List[List[Optional[str]]] = [[None, None]]
+    for m in BOARD_DOCS_JSON_TOKEN_RE.finditer(script):
+        top = stack[-1]
+        if m.group("url") is not None:
+            if top[0] is not None:
+                yield top[0], top[1]
+                top[1] = None
+            top[0] = m.group("url")
+        elif m.group("name") is not None:
+            top[1] = m.group("name")
+        elif m.group(0) == "{":
+            stack.append([None, None])
+        elif len(stack) > 1:
+            stack.pop()
+            if top[0] is not None:
+                yield top[0], top[1]
+    for url, name in reversed(stack):
+        if url is not None:
+            yield url, name
+
+def is_followable_href(href: Optional[str]) -> bool:
+    """False for empty hrefs, #fragments and mailto:/javascript:/tel: links."""
+    return bool(href) and not _NON_PAGE_HREF_RE.match(href)
+
+def pool_title(title: str) -> str:
+    """
+    Intern short link titles: the same "Minutes" / attachment labels repeat
+    across hundreds of anchors, so equal titles can share one string object.
+    """
+    return sys.intern(title) if len(title) < 64 else title
+
+def collect_links_from_tree(page_url: str, tree: Optional[lxml_html.HtmlElement],
+                            anchors_xpath: Optional[etree.XPath] = None,
+                            max_items: Optional[int] = None,
+                            boarddocs_only: bool = False) -> List[LinkItem]:
+    """
+    Link discovery over an already-parsed page, so crawlers can reuse the
+    same tree for their own frontier expansion.
+
+    `anchors_xpath` narrows which anchors are considered (e.g. _CONTENT_A_XPATH
+    for district pages); if it matches nothing, every <a href> is used.
+    `max_items` stops the scan once that many links are collected, and
+    `boarddocs_only` skips district-link matching, for the BoardDocs crawl.
+    """
+    items: List[LinkItem] = []
     seen: Set[str] = set()
+    limit = max_items if max_items is not None else sys.maxsize
+
+    logging.info("Collecting links from %s", page_url)
+    if tree is None or limit <= 0:
+        return items
+
+    anchors = anchors_xpath(tree) if anchors_xpath is not None else []
+    if not anchors:
+        anchors = _A_XPATH(tree)
+
+    # Local aliases: this loop runs once per anchor on every crawled page
+    _urljoin, _canon, _text = urljoin, canonical_url, anchor_text
+    _is_boarddocs, _is_district_file = BOARD_DOCS_FILE_RE.search, _DISTRICT_FILE_RE.search
+    _is_meeting_title = _MEETING_TITLE_RE.search
+    _append, _seen_add = items.append, seen.add
+    _log = logging.info
+    _followable = is_followable_href
+    _pool = pool_title
+
+    for a in anchors:
+        href = a.get("href")
+        if not _followable(href):
+            continue
+        full = _urljoin(page_url, href)
+        title = _text(a) or full
 
-    logging.info(f"Collecting links from {page_url}")
-
-    for a in soup.find_all("a", href=True):
-        href = a.get("href") or ""
-        full = urljoin(page_url, href)
-        title = a.get_text(strip=True) or full
-        lower_full = full.lower()
-        lower_title = title.lower()
+        key = _canon(full)
 
-        if BOARD_DOCS_FILE_RE.search(full):
-            if full not in seen:
-                seen.add(full)
-                items.append({"title": title or "BoardDocs Attachment", "url": full, "source": "boarddocs"})
-                logging.info(f"Found BoardDocs: {full}")
+        if _is_boarddocs(full):
+            if key not in seen:
+                _seen_add(key)
+                _append(LinkItem(_pool(title or "BoardDocs Attachment"), full, "boarddocs"))
+                _log("Found BoardDocs: %s", full)
+                if len(items) >= limit:
+                    break
+            continue
+        if boarddocs_only:
             continue
 
-        # Broad match for Delran minutes / file handlers
-        if 'getfile.ashx' in lower_full or 'displayfile.aspx' in lower_full or \
-           any(word in lower_title for word in ['minutes', 'agenda', 'boe', 'board', 'reorganization', 're-organ', 'session', 'meeting', 'work session']):
-            if full not in seen:
-                seen.add(full)
-                items.append({
-                    "title": title or "Delran Meeting Document",
-                    "url": full,
-                    "source": "district"
-                })
-                logging.info(f"FOUND DELRAN DOCUMENT: {full} ({title})")
+        # Broad match for Delran minutes / file handlers; a plain PDF/DOCX
+        # link with a generic label qualifies if its row names a meeting
+        if not (_is_district_file(full) or _is_meeting_title(title)):
+            if doc_kind(full) not in ("pdf", "docx"):
+                continue
+            context = row_context(a)
+            if not _is_meeting_title(context):
+                continue
+            title = context
+        if key not in seen:
+            _seen_add(key)
+            _append(LinkItem(_pool(title or "Delran Meeting Document"), full, "district"))
+            _log("FOUND DELRAN DOCUMENT: %s (%s)", full, title)
+            if len(items) >= limit:
+                break
 
     # BoardDocs JSON in scripts
-    for script in soup.find_all("script"):
-        s = script.string or script.get_text() or ""
+    for s in _SCRIPT_TEXT_XPATH(tree):
+        if len(items) >= limit:
+            break
         if not s:
             continue
-        for m_url in BOARD_DOCS_JSON_URL_RE.finditer(s):
-            file_url = urljoin(page_url, m_url.group(1))
-            if file_url not in seen:
-                seen.add(file_url)
-                name_match = BOARD_DOCS_JSON_NAME_RE.search(s)
-                fname = name_match.group(1) if name_match else "BoardDocs Attachment"
-                items.append({"title": fname, "url": file_url, "source": "boarddocs"})
-                logging.info(f"Found BoardDocs JSON: {file_url}")
-
-    logging.info(f"Collected {len(items)} links from {page_url}")
+        for url, fname in boarddocs_json_files(s):
+            file_url = urljoin(page_url, url)
+            key = canonical_url(file_url)
+            if key not in seen:
+                seen.add(key)
+                items.append(LinkItem(pool_title(fname or "BoardDocs Attachment"), file_url, "boarddocs"))
+                logging.info("Found BoardDocs JSON: %s", file_url)
+                if len(items) >= limit:
+                    break
+
+    logging.info("Collected %d links from %s", len(items), page_url)
     return items
 
+def dedupe_links(items: Iterable[LinkItem]) -> List[LinkItem]:
+    # First occurrence wins; dicts keep insertion order
+    uniq: Dict[str, LinkItem] = {}
+    for it in items:
+        uniq.setdefault(canonical_url(it.url), it)
+    return list(uniq.values())
+
+def polite_fetch(url: str) -> requests.Response:
+    polite_delay(url)
+    return fetch(url)
+
+def first_copy(body: bytes, digests: Set[bytes]) -> bool:
+    """
+    True the first time a page body is seen in this crawl. The same page is
+    often served under several URLs (reordered query strings, aliases); a
+    repeat would only yield links we already have.
+    """
+    d = hashlib.blake2b(body, digest_size=16).digest()
+    if d in digests:
+        return False
+    digests.add(d)
+    return True
+
 def crawl_district(start_urls: Iterable[str], allowed_domains: Set[str],
-                   max_pages: int, max_depth: int) -> List[Dict[str, str]]:
-    queue: List[Tuple[str, int]] = [(u, 0) for u in start_urls]
+                   max_pages: int, max_depth: int) -> List[LinkItem]:
+    queue: Deque[Tuple[str, int]] = deque((u, 0) for u in start_urls)
     visited: Set[str] = set()
-    results: List[Dict[str, str]] = []
-
-    while queue and len(visited) < max_pages:
-        url, depth = queue.pop(0)
-        if url in visited:
-            continue
-        visited.add(url)
-
-        if not is_allowed_domain(url, allowed_domains):
-            continue
-
-        try:
-            resp = fetch(url)
-        except Exception as e:
-            logging.warning("District fetch failed %s: %s", url, e)
-            continue
-
-        save_debug_html(f"district_{len(visited):03d}.html", resp.content)
-
-        results.extend(collect_links_from_html(url, resp.text))
-
-        if depth < max_depth:
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            pagination_patterns = re.compile(r'(next|>|»|more|\.{3}|page\s*\d+|pg=|p=)', re.IGNORECASE)
-            next_links = (
-                soup.find_all('a', string=pagination_patterns) +
-                soup.find_all('a', href=re.compile(r'(page|pg|p)=', re.IGNORECASE))
-            )
-
-            for a in next_links:
-                h = a.get('href') or ''
-                nxt = urljoin(url, h)
-                if nxt not in visited and is_allowed_domain(nxt, allowed_domains) and nxt != url:
-                    queue.append((nxt, depth + 1))
-                    logging.info(f"Queued pagination link: {nxt}")
-
-            for a in soup.find_all("a", href=True):
-                h = a.get("href") or ""
-                nxt = urljoin(url, h)
-                if (nxt not in visited and
-                    is_allowed_domain(nxt, allowed_domains) and
-                    any(kw in nxt.lower() for kw in ['minutes', 'boe', 'board', 'meeting', 'agenda', 'getfile', 'displayfile'])):
-                    queue.append((nxt, depth + 1))
-                    logging.info(f"Queued related minutes link: {nxt}")
-
-    out, seen = [], set()
-    for it in results:
-        if it["url"] not in seen:
-            seen.add(it["url"])
-            out.append(it)
+    # Everything ever queued, so a link repeated across anchors is queued once
+    enqueued: Set[str] = {canonical_url(u) for u, _ in queue}
+    page_digests: Set[bytes] = set()
+    results: List[LinkItem] = []
+
+    workers = max(1, CRAWL_WORKERS)
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as ex:
+        while queue and len(visited) < max_pages:
+            # Fetch the next wave concurrently (polite_delay still spaces out
+            # requests per host), then parse it in queue order on this thread
+            wave: List[Tuple[str, int, object]] = []
+            while queue and len(wave) < workers and len(visited) < max_pages:
+                url, depth = queue.popleft()
+                if canonical_url(url) in visited:
+                    continue
+                visited.add(canonical_url(url))
+
+                if not is_allowed_domain(url, allowed_domains):
+                    continue
+
+                if not can_fetch(url):
+                    logging.info("Disallowed by robots.txt: %s", url)
+                    continue
+
+                wave.append((url, depth, ex.submit(polite_fetch, url)))
+
+            for url, depth, fut in wave:
+                try:
+                    resp = fut.result()
+                except Exception as e:
+                    logging.warning("District fetch failed %s: %s", url, e)
+                    continue
+                fetched += 1
+                save_debug_html(f"district_{fetched:03d}.html", resp.content)
+                if not first_copy(resp.content, page_digests):
+                    logging.info("Same page body already crawled, skipping %s", url)
+                    continue
+
+                tree = parse_html(resp.content, declared_encoding(resp))
+                del resp  # the tree is all we need; let the page bytes go
+                results.extend(collect_links_from_tree(url, tree, _CONTENT_A_XPATH))
+
+                if tree is not None and depth < max_depth:
+                    # Resolve each followable href once for both passes below
+                    links: List[Tuple[lxml_html.HtmlElement, str, str]] = []
+                    for a in _A_XPATH(tree):
+                        h = a.get("href")
+                        if is_followable_href(h):
+                            links.append((a, h, urljoin(url, h)))
+
+                    # One pass over the anchors: href test first, it skips the
+                    # text_content() walk for most pagination links
+                    next_links = [
+                        nxt for a, h, nxt in links
+                        if _PAGINATION_HREF_RE.search(h) or _PAGINATION_TEXT_RE.search(anchor_text(a))
+                    ]
+
+                    for nxt in next_links:
+                        key = canonical_url(nxt)
+                        if key not in enqueued and is_allowed_domain(nxt, allowed_domains):
+                            enqueued.add(key)
+                            queue.append((nxt, depth + 1))
+                            logging.debug("Queued pagination link: %s", nxt)
+
+                    for a, h, nxt in links:
+                        # Keyword test first: it rejects most links before
+                        # canonical_url() builds a new string for them
+                        if not _RELATED_LINK_RE.search(nxt):
+                            continue
+                        key = canonical_url(nxt)
+                        if key not in enqueued and is_allowed_domain(nxt, allowed_domains):
+                            enqueued.add(key)
+                            queue.append((nxt, depth + 1))
+                            logging.debug("Queued related minutes link: %s", nxt)
+
+    out = dedupe_links(results)
     logging.info("District links discovered: %d (pages crawled=%d)", len(out), len(visited))
     return out
 
-def crawl_boarddocs(root_url: str, max_files: int) -> List[Dict[str, str]]:
+def crawl_boarddocs(root_url: str, max_files: int, max_pages: int = MAX_BOARDDOCS_PAGES) -> List[LinkItem]:
     if max_files <= 0:
         return []
 
-    queue: List[str] = [root_url]
+    queue: Deque[str] = deque([root_url])
     visited: Set[str] = set()
-    items: List[Dict[str, str]] = []
-    page_budget = 30
-
-    while queue and page_budget > 0 and len(items) < max_files:
-        url = queue.pop(0)
-        if url in visited:
-            continue
-        visited.add(url)
-        page_budget -= 1
-
-        try:
-            resp = fetch(url)
-        except Exception as e:
-            logging.warning("BoardDocs fetch failed %s: %s", url, e)
-            continue
-
-        save_debug_html(f"boarddocs_{len(visited):03d}.html", resp.content)
-        html = resp.text
-
-        new_links = collect_links_from_html(url, html)
-        for it in new_links:
-            if it.get("source") == "boarddocs":
-                items.append(it)
+    enqueued: Set[str] = {canonical_url(root_url)}
+    page_digests: Set[bytes] = set()
+    items: List[LinkItem] = []
+    item_keys: Set[str] = set()
+    pages_crawled = 0
+
+    workers = max(1, CRAWL_WORKERS)
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="boarddocs") as ex:
+        while queue and pages_crawled < max_pages and len(items) < max_files:
+            # Same wave scheme as crawl_district: fetch a batch concurrently,
+            # then parse and expand it in queue order on this thread
+            wave: List[Tuple[str, object]] = []
+            while queue and len(wave) < workers and pages_crawled < max_pages:
+                url = queue.popleft()
+                if canonical_url(url) in visited:
+                    continue
+                visited.add(canonical_url(url))
+                pages_crawled += 1
+
+                if not can_fetch(url):
+                    logging.info("Disallowed by robots.txt: %s", url)
+                    continue
+
+                # polite_fetch: the per-host delay / Crawl-delay also spaces
+                # out the concurrent BoardDocs requests
+                wave.append((url, ex.submit(polite_fetch, url)))
+
+            for url, fut in wave:
                 if len(items) >= max_files:
                     break
-        if len(items) >= max_files:
-            break
-
-        soup = BeautifulSoup(html, "lxml")
-        for a in soup.find_all("a", href=True):
-            h = a.get("href") or ""
-            nxt = urljoin(url, h)
-            if (nxt.startswith("https://go.boarddocs.com/")
-                    and nxt not in visited
-                    and len(queue) < 20):
-                queue.append(nxt)
-
-        for m in BOARD_DOCS_FILE_RE.finditer(html):
-            f_url = urljoin(url, m.group(0))
-            if all(x["url"] != f_url for x in items):
-                items.append({"title": "BoardDocs Attachment", "url": f_url, "source": "boarddocs"})
+                try:
+                    resp = fut.result()
+                except Exception as e:
+                    logging.warning("BoardDocs fetch failed %s: %s", url, e)
+                    continue
+
+                fetched += 1
+                save_debug_html(f"boarddocs_{fetched:03d}.html", resp.content)
+                if not first_copy(resp.content, page_digests):
+                    logging.info("Same page body already crawled, skipping %s", url)
+                    continue
+                html = resp.content
+                tree = parse_html(html, declared_encoding(resp))
+
+                # Only BoardDocs files count, and only up to what the budget has left
+                for it in collect_links_from_tree(url, tree, max_items=max_files - len(items), boarddocs_only=True):
+                    key = canonical_url(it.url)
+                    if key not in item_keys:
+                        item_keys.add(key)
+                        items.append(it)
                 if len(items) >= max_files:
                     break
 
-    out, seen = [], set()
-    for it in items:
-        if it["url"] not in seen:
-            seen.add(it["url"])
-            out.append(it)
+                _urljoin, _canon, _is_nav, _enqueue = urljoin, canonical_url, _BOARDDOCS_NAV_RE.match, queue.append
+                for a in (_A_XPATH(tree) if tree is not None else []):
+                    href = a.get("href")
+                    if not is_followable_href(href):
+                        continue
+                    nxt = _urljoin(url, href)
+                    if not _is_nav(nxt) or len(queue) >= BOARDDOCS_FRONTIER_CAP:
+                        continue
+                    key = _canon(nxt)
+                    if key not in enqueued:
+                        enqueued.add(key)
+                        _enqueue(nxt)
+
+                for m in BOARD_DOCS_FILE_RE.finditer(html.decode("utf-8", "ignore")):
+                    f_url = urljoin(url, m.group(0))
+                    key = canonical_url(f_url)
+                    if key not in item_keys:
+                        item_keys.add(key)
+                        items.append(LinkItem("BoardDocs Attachment", f_url, "boarddocs"))
+                        if len(items) >= max_files:
+                            break
+
+    out = dedupe_links(items)
     logging.info("BoardDocs links discovered: %d (pages visited=%d)", len(out), len(visited))
     return out
 
-def get_minutes_links() -> List[Dict[str, str]]:
+def get_minutes_links() -> List[LinkItem]:
     # District crawl is blocked by bot protection - use BoardDocs only
     # start_urls = [BASE_URL, BOE_URL]
     # district_links = crawl_district(start_urls, ALLOWED_DISTRICT_DOMAINS, MAX_DISTRICT_PAGES, MAX_CRAWL_DEPTH)
     boarddocs_links = crawl_boarddocs(BOARDDOCS_PUBLIC, MAX_BOARDDOCS_FILES)
+    # Each crawler dedupes its own output; with the district crawl back on,
+    # dedupe the combined list so a file both of them found is fetched once:
+    # all_links = dedupe_links(district_links + boarddocs_links)
     all_links = boarddocs_links
     if YEAR:
-        all_links = [link for link in all_links if str(YEAR) in link["url"] or str(YEAR) in link["title"]]
+        all_links = [link for link in all_links if str(YEAR) in link.url or str(YEAR) in link.title]
     logging.info(f"Total minutes links discovered (BoardDocs only): {len(all_links)}")
     return all_links
 
 # ---------------------------- State Management ------------------------------
 
 def load_state() -> Dict:
-    if FORCE_FULL_RESCAN or not os.path.exists(STATE_FILE):
-        return {"seen_hashes": [], "seen_urls": [], "backfill_done": False, "last_run_end": None}
-    with open(STATE_FILE, 'r') as f:
-        return json.load(f)
-
-def save_state(state: Dict) -> None:
-    state["last_run_end"] = datetime.utcnow().isoformat()
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    """
+    seen_hashes and seen_urls are held in memory as insertion-ordered dicts
+    (used as ordered sets): O(1) membership and no duplicate entries, while
+    keeping the order that save_state's most-recent-N trim relies on.
+    """
+    fresh = {"seen_hashes": {}, "seen_urls": {}, "validators": {}, "backfill_done": False, "last_run_end": None}
+    if FORCE_FULL_RESCAN:
+        # Checkpoints of an earlier run belong to the state being discarded;
+        # this run's own checkpoints must not land on top of them
+        discard_journal()
+        _mark_journaled(fresh)
+        _DIRTY_VALIDATORS.clear()
+        return fresh
+    if os.path.exists(STATE_FILE):
+        with open(STATE_FILE, 'rb') as f:
+            state = orjson.loads(f.read()) if orjson else json.load(f)
+        state.setdefault("validators", {})
+        state["seen_hashes"] = dict.fromkeys(state.get("seen_hashes") or [])
+        state["seen_urls"] = dict.fromkeys(state.get("seen_urls") or [])
+    else:
+        state = fresh
+    # A run that stopped after a checkpoint left its progress in the journal
+    replay_journal(state)
+    # Fingerprints written before the switch to digest_of are 40-char SHA-1
+    state["legacy_sha1"] = any(len(h) == 40 for h in state["seen_hashes"])
+    return state
+
+# State keys computed at load time and never written back to STATE_FILE
+_RUNTIME_KEYS = ("legacy_sha1",)
+
+# How many seen_hashes / seen_urls / pending_results entries are already on
+# disk (STATE_FILE plus journal); all only grow at the end, so a checkpoint
+# writes the tail. Validators are re-inserted on update, so changed URLs are
+# tracked instead.
+_APPEND_ONLY_KEYS = ("seen_hashes", "seen_urls", "pending_results")
+_JOURNAL_MARKS: Dict[str, int] = {}
+_DIRTY_VALIDATORS: Set[str] = set()
+
+def _mark_journaled(state: Dict) -> None:
+    for key in _APPEND_ONLY_KEYS:
+        _JOURNAL_MARKS[key] = len(state.get(key) or ())
+
+def discard_journal() -> None:
+    try:
+        os.remove(STATE_JOURNAL)
+    except FileNotFoundError:
+        pass
+
+def replay_journal(state: Dict) -> None:
+    """
+    Apply checkpoint records from STATE_JOURNAL on top of the loaded state.
+    A torn last line (crash mid-append) is ignored.
+    """
+    replayed = 0
+    try:
+        with open(STATE_JOURNAL, 'rb') as f:
+            for line in f:
+                try:
+                    rec = orjson.loads(line) if orjson else json.loads(line)
+                except ValueError:
+                    break
+                state["seen_hashes"].update(dict.fromkeys(rec.get("seen_hashes", ())))
+                state["seen_urls"].update(dict.fromkeys(rec.get("seen_urls", ())))
+                for url, pair in rec.get("validators", ()):
+                    state["validators"].pop(url, None)
+                    state["validators"][url] = pair
+                if rec.get("pending_results"):
+                    state.setdefault("pending_results", []).extend(rec["pending_results"])
+                replayed += 1
+    except FileNotFoundError:
+        pass
+    if replayed:
+        logging.info("Replayed %d checkpoint records from %s", replayed, STATE_JOURNAL)
+    _mark_journaled(state)
+
+def append_journal(state: Dict) -> None:
+    """Checkpoint: append one JSONL record with the entries added since the last one."""
+    rec: Dict[str, object] = {
+        key: list(itertools.islice(state.get(key) or (), _JOURNAL_MARKS.get(key, 0), None))
+        for key in _APPEND_ONLY_KEYS
+    }
+    validators = state["validators"]
+    rec["validators"] = [(url, validators[url]) for url in _DIRTY_VALIDATORS if url in validators]
+    _mark_journaled(state)
+    _DIRTY_VALIDATORS.clear()
+    line = orjson.dumps(rec) if orjson else json.dumps(rec).encode("utf-8")
+    with open(STATE_JOURNAL, 'ab') as f:
+        f.write(line + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def save_state(state: Dict, checkpoint: bool = False) -> None:
+    """
+    checkpoint=True is a mid-run save: only what changed since the previous
+    checkpoint is appended to STATE_JOURNAL, and last_run_end is left alone
+    so a run that dies part-way is not recorded as finished. The final save
+    rewrites STATE_FILE in full and removes the journal.
+    """
+    if checkpoint:
+        append_journal(state)
+        return
+    state["last_run_end"] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+    out = dict(state)
+    # Derived by load_state() on every run; not part of the file format
+    for key in _RUNTIME_KEYS:
+        out.pop(key, None)
+    out["seen_hashes"] = list(state["seen_hashes"])
+    out["seen_urls"] = list(state["seen_urls"])
+    out["validators"] = list(state["validators"].items())
+    # Keep only the most recent fingerprints. A trimmed document counts as new
+    # again and is re-reported if it is still linked and still matches, so
+    # MAX_SEEN_HASHES should stay well above the number of matching documents.
+    if MAX_SEEN_HASHES > 0:
+        out["seen_hashes"] = out["seen_hashes"][-MAX_SEEN_HASHES:]
+        out["seen_urls"] = out["seen_urls"][-MAX_SEEN_HASHES:]
+        out["validators"] = out["validators"][-MAX_SEEN_HASHES:]
+    out["validators"] = dict(out["validators"])
+    # Write to a temp file and rename so a crash mid-write never corrupts state
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, 'wb') as f:
+        if orjson:
+            f.write(orjson.dumps(out))
+        else:
+            f.write(json.dumps(out).encode("utf-8"))
+    os.replace(tmp, STATE_FILE)
+    # Everything in the journal is now in STATE_FILE
+    discard_journal()
+    _mark_journaled(state)
+    _DIRTY_VALIDATORS.clear()
 
 # ---------------------------- Processing ------------------------------
 
-def process_document(link: Dict[str, str], state: Dict) -> Optional[Dict]:
-    url = link["url"]
-    title = link["title"]
+def mark_seen(link: LinkItem, state: Dict) -> None:
+    state["seen_hashes"][digest_of(link.url, link.title)] = None
+    state["seen_urls"][link.url] = None
+
+def response_validators(resp) -> Optional[List[str]]:
+    headers = getattr(resp, "headers", None) or {}
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if etag or last_modified:
+        return [etag, last_modified]
+    return None
+
+def remember_validators(url: str, validators: List[str], state: Dict) -> None:
+    state["validators"].pop(url, None)  # re-insert so recent URLs survive the trim
+    state["validators"][url] = validators
+    _DIRTY_VALIDATORS.add(url)
+
+def is_seen(url: str, title: str, state: Dict, source: str = "") -> bool:
+    seen = state["seen_hashes"]
+    if digest_of(url, title) in seen:
+        return True
+    if state.get("legacy_sha1") and sha1_of(url, title) in seen:
+        return True
+    # A BoardDocs file URL names exactly one attachment. Attachments listed in
+    # page JSON used to take the script's first fileName as their title, so
+    # their fingerprints no longer match; the reported URL still does.
+    return source == "boarddocs" and url in state["seen_urls"]
+
+# File signatures; PDF readers accept the header anywhere in the first 1 KiB
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+
+def has_expected_signature(kind: str, body: IO[bytes]) -> bool:
+    """
+    Peek at the first bytes so HTML error/captcha pages served under a .pdf
+    or .docx URL are rejected before PyPDF2/python-docx try to parse them.
+    """
+    head = body.read(1024)
+    body.seek(0)
+    if kind == "pdf":
+        return _PDF_MAGIC in head
+    if kind == "docx":
+        return head.startswith(_ZIP_MAGIC)
+    return True
+
+def extract_pdf_text(body: IO[bytes]) -> Tuple[str, bool]:
+    """
+    Page-by-page PDF text. With PDF_GIVE_UP_PAGES set, a file with no keyword
+    hit in its first N pages is abandoned; the flag says whether the text is
+    complete (partial text must not be cached).
+    """
+    if PDF_GIVE_UP_PAGES <= 0:
+        return extract_text_from_pdf(body), True
+    pages: List[str] = []
+    hit = False
+    for n, txt in enumerate(extract_text_from_pdf_pages(body), 1):
+        if txt:
+            pages.append(txt)
+            hit = hit or KEYWORD_REGEX.search(txt) is not None
+        if not hit and n >= PDF_GIVE_UP_PAGES:
+            return "\n".join(pages), False
+    return "\n".join(pages), True
+
+def extract_document_text(kind: str, body: IO[bytes], resp) -> Tuple[str, bool]:
+    if kind == "pdf":
+        return extract_pdf_text(body)
+    if kind == "docx":
+        return extract_text_from_docx(body), True
+    tree = parse_html(body.read(), declared_encoding(resp))
+    nodes = _BODY_TEXT_XPATH(tree) if tree is not None else []
+    return "\n".join(filter(None, (t.strip() for t in nodes))), True
+
+def body_digest(body: IO[bytes]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: body.read(64 * 1024), b""):
+        h.update(chunk)
+    body.seek(0)
+    return h.hexdigest()
 
-    hash_key = sha1_of(url, title)
-    if not IGNORE_DEDUPE and hash_key in state["seen_hashes"] and not FORCE_FULL_RESCAN:
-        logging.info("Skipping seen: %s", url)
-        return None
+def cached_document_text(kind: str, body: IO[bytes], resp) -> str:
+    """
+    PDF/DOCX text keyed by a hash of the file bytes, so a document that shows
+    up again under any URL is only extracted once. HTML is cheap to re-parse
+    and is never cached.
+    """
+    if kind == "html" or not PARSED_CACHE_DIR:
+        return extract_document_text(kind, body, resp)[0]
 
-    polite_delay()
+    path = os.path.join(PARSED_CACHE_DIR, f"{kind}-{body_digest(body)}.txt")
     try:
-        resp = fetch(url)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        os.utime(path)  # recently used; see prune_parsed_cache
+        return text
+    except OSError:
+        pass
+
+    text, complete = extract_document_text(kind, body, resp)
+    if not complete:
+        return text
+    try:
+        os.makedirs(PARSED_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=PARSED_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError as e:
+        logging.warning("Could not cache extracted text %s: %s", path, e)
+    return text
+
+def prune_parsed_cache(max_age_days: int = PARSED_CACHE_DAYS) -> None:
+    if not PARSED_CACHE_DIR or not os.path.isdir(PARSED_CACHE_DIR):
+        return
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    with os.scandir(PARSED_CACHE_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+    if removed:
+        logging.info("Pruned %d stale entries from %s", removed, PARSED_CACHE_DIR)
+
+def upgrade_legacy_fingerprints(links: Iterable[LinkItem], state: Dict) -> None:
+    """
+    Re-key links that are only known by their old SHA-1 fingerprint under
+    digest_of, so they stay deduped once the SHA-1 entries are trimmed away.
+    """
+    if not state.get("legacy_sha1"):
+        return
+    seen = state["seen_hashes"]
+    upgraded = 0
+    for link in links:
+        key = digest_of(link.url, link.title)
+        if key not in seen and sha1_of(link.url, link.title) in seen:
+            seen[key] = None
+            upgraded += 1
+    if upgraded:
+        logging.info("Upgraded %d legacy SHA-1 fingerprints", upgraded)
+
+def process_document(link: LinkItem, state: Dict) -> Tuple[Optional[Dict], Optional[List[str]]]:
+    """
+    Fetch and scan one document; runs on worker threads and only reads state.
+    Returns (result, validators): the match (or None) and the document's
+    [ETag, Last-Modified] pair, which is only given once the text was
+    extracted, so a document that failed to parse is fetched in full next
+    time. The caller records both with mark_seen() / remember_validators()
+    in the same step, so a checkpoint never holds a new ETag without the
+    match that goes with it.
+    """
+    url = link.url
+    title = link.title
+
+    if not IGNORE_DEDUPE and is_seen(url, title, state, link.source) and not FORCE_FULL_RESCAN:
+        logging.info("Skipping seen: %s", url)
+        return None, None
+
+    # Dated links (e.g. ".../2019-05-14-regular.pdf") can be ruled out without a download
+    if MIN_YEAR:
+        hinted = guess_date_from_url_or_title(url, title)
+        if hinted and hinted.year < MIN_YEAR:
+            logging.info("Skipping pre-%d document (date from link): %s", MIN_YEAR, url)
+            return None, None
+
+    if not can_fetch(url):
+        logging.info("Disallowed by robots.txt: %s", url)
+        return None, None
+
+    # A 304 is only safe to skip when seen_hashes is consulted for the match
+    prior = None if (FORCE_FULL_RESCAN or IGNORE_DEDUPE) else state["validators"].get(url)
+    polite_delay(url)
+    try:
+        resp, body = fetch_document(url, prior)
     except Exception as e:
         logging.warning("Doc fetch failed %s: %s", url, e)
-        return None
+        return None, None
 
-    content = resp.content
-    ext = url.lower().split('.')[-1] if '.' in url else ""
+    # Unchanged since a run that already scanned it; any match is in seen_hashes
+    if prior and resp.status_code == 304:
+        body.close()
+        logging.info("Unchanged since last run: %s", url)
+        return None, None
 
-    if ext == "pdf":
-        text = extract_text_from_pdf(content)
-    elif ext in ("docx", "doc"):
-        text = extract_text_from_docx(content)
-    elif ext in ("htm", "html") or 'getfile.ashx' in url.lower() or 'displayfile' in url.lower():
-        soup = BeautifulSoup(content, "lxml")
-        text = soup.get_text(separator="\n", strip=True)
-    else:
+    kind = doc_kind(url)
+    if kind is None:
+        body.close()
         logging.warning("Unsupported format: %s", url)
-        return None
+        return None, None
+
+    with body:
+        if not has_expected_signature(kind, body):
+            logging.warning("Not a %s despite the URL, skipping: %s", kind.upper(), url)
+            return None, None
+        text = cached_document_text(kind, body, resp)
+    validators = response_validators(resp)
 
     mentions = find_preschool_mentions(text)
     if not mentions:
-        return None
+        return None, validators
 
     date_dt = guess_meeting_date(text, title=title, url=url)
     date_str = date_dt.strftime("%Y-%m-%d") if date_dt else ""
 
     if MIN_YEAR and date_dt and date_dt.year < MIN_YEAR:
-        return None
+        return None, validators
 
     result = {
         "url": url,
@@ -418,47 +1358,77 @@ def process_document(link: Dict[str, str], state: Dict) -> Optional[Dict]:
         "date": date_str,
         "mentions": mentions
     }
-
-    state["seen_hashes"].append(hash_key)
-    state["seen_urls"].append(url)
-    return result
+    return result, validators
 
 # ---------------------------- Reporting ------------------------------
 
 def write_report_csv(results: List[Dict]) -> None:
-    with open("report.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["url", "title", "date", "keyword", "snippet"])
-        writer.writeheader()
-        for r in results:
-            for m in r.get("mentions", []):
-                writer.writerow({
-                    "url": r["url"],
-                    "title": r["title"],
-                    "date": r["date"],
-                    "keyword": m["keyword"],
-                    "snippet": m["snippet"]
-                })
-
-def write_scanned_csv(links: List[Dict[str, str]]) -> None:
-    with open("scanned.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["url", "title", "source"])
-        writer.writeheader()
-        for link in links:
-            writer.writerow(link)
+    # Generator: writerows pulls rows straight into the buffered file
+    rows = (
+        (r["url"], r["title"], r["date"], m["keyword"], m["snippet"])
+        for r in results
+        for m in r.get("mentions", [])
+    )
+    with open("report.csv", "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(("url", "title", "date", "keyword", "snippet"))
+        writer.writerows(rows)
+
+def write_scanned_csv(links: List[LinkItem]) -> None:
+    rows = ((link.url, link.title, link.source) for link in links)
+    with open("scanned.csv", "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(("url", "title", "source"))
+        writer.writerows(rows)
 
 # ---------------------------- Main ------------------------------
 
 def main():
+    restore_dns = install_dns_cache() if DNS_CACHE else None
+    try:
+        run()
+    finally:
+        close_browser()
+        if restore_dns:
+            restore_dns()
+
+def run():
     state = load_state()
+    # Matches from a run that died after a checkpoint but before reporting;
+    # they are already in seen_hashes, so this is the only way they get sent
+    carried: List[Dict] = state.pop("pending_results", None) or []
+    if carried:
+        logging.info("Carrying over %d unreported matches from an interrupted run", len(carried))
 
     links = get_minutes_links()
     write_scanned_csv(links)
-
-    results: List[Dict] = []
-    for link in links:
-        res = process_document(link, state)
-        if res:
-            results.append(res)
+    upgrade_legacy_fingerprints(links, state)
+
+    # Fetch/extract in parallel; state is only written here on the main thread.
+    # pending_results only grows, so each checkpoint journals just the new ones.
+    state["pending_results"] = list(carried)
+    found: Dict[int, Dict] = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, DOC_WORKERS)) as ex:
+        futures = {ex.submit(process_document, link, state): i for i, link in enumerate(links)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            done += 1
+            try:
+                res, validators = fut.result()
+            except Exception as e:
+                logging.warning("Processing failed %s: %s", links[i].url, e)
+                res, validators = None, None
+            if res:
+                mark_seen(links[i], state)
+                found[i] = res
+                state["pending_results"].append(res)
+            if validators:
+                remember_validators(links[i].url, validators, state)
+            if CHECKPOINT_EVERY > 0 and done % CHECKPOINT_EVERY == 0:
+                save_state(state, checkpoint=True)
+    state.pop("pending_results", None)
+    results: List[Dict] = carried + [found[i] for i in sorted(found)]
 
     if results:
         html_body = render_html_report(results)
@@ -492,7 +1462,6 @@ def main():
                     f.write(eml_bytes)
             except Exception as e:
                 logging.error("Email send failed: %s", e)
-                from email.message import EmailMessage
                 msg = EmailMessage()
                 msg['Subject'] = "Delran BOE Preschool Report"
                 msg.set_content("No body provided.")
@@ -502,6 +1471,7 @@ def main():
         else:
             logging.warning("Missing email env vars; skipping send.")
 
+    prune_parsed_cache()
     save_state(state)
 
 if __name__ == "__main__":
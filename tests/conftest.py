@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# The scripts import each other as top-level modules (as the workflow runs them)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+
+def build_pdf(pages):
+    """Minimal valid PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf
+
+
+@pytest.fixture
+def state_paths(tmp_path, monkeypatch):
+    """Point STATE_FILE / STATE_JOURNAL at a temp dir and reset checkpoint bookkeeping."""
+    import scraper
+
+    state_file = tmp_path / "state.json"
+    journal = tmp_path / "state.json.journal"
+    monkeypatch.setattr(scraper, "STATE_FILE", str(state_file))
+    monkeypatch.setattr(scraper, "STATE_JOURNAL", str(journal))
+    monkeypatch.setattr(scraper, "FORCE_FULL_RESCAN", False)
+    monkeypatch.setattr(scraper, "MAX_SEEN_HASHES", 50000)
+    scraper._JOURNAL_MARKS.clear()
+    scraper._DIRTY_VALIDATORS.clear()
+    yield state_file, journal
+    scraper._JOURNAL_MARKS.clear()
+    scraper._DIRTY_VALIDATORS.clear()
@@ -0,0 +1,70 @@
+import scraper
+
+ROOT = "https://go.boarddocs.com/nj/delranschools/Board.nsf/Public"
+PAGES = {
+    ROOT: b'<html><body><a href="https://go.boarddocs.com/nj/delranschools/Board.nsf/page2">Next</a>'
+          b'<a href="https://go.boarddocs.com/nj/delranschools/Board.nsf/files/AAA/download">Minutes</a>'
+          + b" " * 6000 + b"</body></html>",
+    "https://go.boarddocs.com/nj/delranschools/Board.nsf/page2":
+          b'<html><body><a href="https://go.boarddocs.com/nj/delranschools/Board.nsf/files/BBB/download">Agenda</a>'
+          + b" " * 6000 + b"</body></html>",
+}
+
+
+class StubResponse:
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def __init__(self, content):
+        self.content = content
+
+
+def test_boarddocs_crawl_goes_through_polite_delay(monkeypatch):
+    delayed, fetched = [], []
+
+    def fake_fetch(url, referer=None):
+        fetched.append(url)
+        return StubResponse(PAGES.get(url, b"<html></html>"))
+
+    monkeypatch.setattr(scraper, "fetch", fake_fetch)
+    monkeypatch.setattr(scraper, "polite_delay", delayed.append)
+    monkeypatch.setattr(scraper, "can_fetch", lambda url: True)
+    monkeypatch.setattr(scraper, "DEBUG_SAVE_HTML", False)
+
+    links = scraper.crawl_boarddocs(ROOT, max_files=10)
+
+    assert set(PAGES) <= set(fetched)
+    assert sorted(delayed) == sorted(fetched)
+    assert {"Minutes", "Agenda"} <= {link.title for link in links}
+
+
+def test_first_copy_flags_repeated_bodies():
+    digests = set()
+    assert scraper.first_copy(b"<html>page one</html>", digests)
+    assert scraper.first_copy(b"<html>page two</html>", digests)
+    assert not scraper.first_copy(b"<html>page one</html>", digests)
+    assert len(digests) == 2
+
+
+def test_same_body_under_another_url_is_not_parsed_twice(monkeypatch):
+    root = "https://go.boarddocs.com/nj/delranschools/Board.nsf/Public"
+    alias = root + "?open"
+    page = (b'<html><body><a href="%s">Home</a>'
+            b'<a href="https://go.boarddocs.com/nj/delranschools/Board.nsf/files/AAA/download">Minutes</a>'
+            % alias.encode() + b" " * 6000 + b"</body></html>")
+    parsed = []
+    real_collect = scraper.collect_links_from_tree
+
+    def counting_collect(page_url, tree, *args, **kwargs):
+        parsed.append(page_url)
+        return real_collect(page_url, tree, *args, **kwargs)
+
+    monkeypatch.setattr(scraper, "fetch", lambda url, referer=None: StubResponse(page if "files" not in url else b""))
+    monkeypatch.setattr(scraper, "polite_delay", lambda url: None)
+    monkeypatch.setattr(scraper, "can_fetch", lambda url: True)
+    monkeypatch.setattr(scraper, "DEBUG_SAVE_HTML", False)
+    monkeypatch.setattr(scraper, "collect_links_from_tree", counting_collect)
+
+    scraper.crawl_boarddocs(root, max_files=10)
+    assert parsed.count(root) == 1
+    assert alias not in parsed
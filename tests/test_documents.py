@@ -0,0 +1,141 @@
+import os
+import time
+from io import BytesIO
+
+import pytest
+
+import scraper
+
+
+class StreamStub:
+    """Context-managed streaming response, as requests returns for stream=True."""
+
+    def __init__(self, body, content_length=None):
+        self.status_code = 200
+        self.headers = {} if content_length is None else {"Content-Length": str(content_length)}
+        self.body = body
+        self.read_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            self.read_bytes += chunk_size
+            yield self.body[i:i + chunk_size]
+
+
+@pytest.fixture
+def served(monkeypatch):
+    holder = {}
+    monkeypatch.setattr(scraper._SESSION, "get", lambda url, **kwargs: holder["resp"])
+    return holder
+
+
+def test_document_over_declared_size_is_refused_unread(served, monkeypatch):
+    monkeypatch.setattr(scraper, "MAX_DOC_BYTES", 1000)
+    served["resp"] = resp = StreamStub(b"x" * 5000, content_length=5000)
+    with pytest.raises(ValueError):
+        scraper._stream_document("https://example.org/big.pdf", None)
+    assert resp.read_bytes == 0
+
+
+def test_document_without_length_stops_at_the_cap(served, monkeypatch):
+    monkeypatch.setattr(scraper, "MAX_DOC_BYTES", 100 * 1024)
+    served["resp"] = resp = StreamStub(b"x" * (1024 * 1024))
+    with pytest.raises(ValueError):
+        scraper._stream_document("https://example.org/big.pdf", None)
+    assert resp.read_bytes < 1024 * 1024
+
+
+def test_document_under_the_cap_is_returned(served, monkeypatch):
+    monkeypatch.setattr(scraper, "MAX_DOC_BYTES", 0)  # 0 disables the cap
+    served["resp"] = StreamStub(b"%PDF-1.4 body", content_length=13)
+    _, body = scraper._stream_document("https://example.org/a.pdf", None)
+    with body:
+        assert body.read() == b"%PDF-1.4 body"
+
+
+@pytest.fixture
+def parsed_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "parsed"
+    monkeypatch.setattr(scraper, "PARSED_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(scraper, "PDF_GIVE_UP_PAGES", 0)
+    return cache_dir
+
+
+def test_parsed_text_is_cached_by_content(parsed_cache, make_pdf, monkeypatch):
+    pdf = make_pdf(["Preschool expansion"])
+    text = scraper.cached_document_text("pdf", BytesIO(pdf), None)
+    assert "Preschool expansion" in text
+    assert len(os.listdir(parsed_cache)) == 1
+
+    def no_extract(*args):
+        raise AssertionError("cached text should be used")
+
+    monkeypatch.setattr(scraper, "extract_document_text", no_extract)
+    assert scraper.cached_document_text("pdf", BytesIO(pdf), None) == text
+
+
+def test_html_is_never_cached(parsed_cache):
+    html = b"<html><body><p>Pre-K update</p></body></html>"
+    assert scraper.cached_document_text("html", BytesIO(html), None) == "Pre-K update"
+    assert not parsed_cache.exists()
+
+
+def test_prune_removes_only_stale_entries(parsed_cache, make_pdf):
+    for n in range(2):
+        scraper.cached_document_text("pdf", BytesIO(make_pdf([f"Document {n}"])), None)
+    stale, fresh = sorted(parsed_cache.iterdir())
+    old = time.time() - 200 * 86400
+    os.utime(stale, (old, old))
+
+    scraper.prune_parsed_cache(max_age_days=120)
+    assert list(parsed_cache.iterdir()) == [fresh]
+
+
+@pytest.mark.parametrize("kind, head, expected", [
+    ("pdf", b"%PDF-1.7\n...", True),
+    ("pdf", b"\xef\xbb\xbf\r\n%PDF-1.4", True),  # header may follow junk within the first 1 KiB
+    ("pdf", b"<!DOCTYPE html><title>Just a moment...</title>", False),
+    ("docx", b"PK\x03\x04rest-of-zip", True),
+    ("docx", b"<html>Access denied</html>", False),
+    ("html", b"anything", True),
+])
+def test_has_expected_signature(kind, head, expected):
+    body = BytesIO(head)
+    assert scraper.has_expected_signature(kind, body) is expected
+    assert body.tell() == 0
+
+
+LATE_HIT = ["Call to order", "Roll call", "Minutes approved", "Preschool expansion"]
+
+
+def test_pdf_give_up_stops_without_an_early_hit(parsed_cache, make_pdf, monkeypatch):
+    monkeypatch.setattr(scraper, "PDF_GIVE_UP_PAGES", 2)
+    text, complete = scraper.extract_pdf_text(BytesIO(make_pdf(LATE_HIT)))
+    assert not complete
+    assert "Roll call" in text and "Preschool" not in text
+
+    # Partial text is never cached
+    scraper.cached_document_text("pdf", BytesIO(make_pdf(LATE_HIT)), None)
+    assert not parsed_cache.exists()
+
+
+def test_pdf_give_up_reads_on_after_a_hit(parsed_cache, make_pdf, monkeypatch):
+    monkeypatch.setattr(scraper, "PDF_GIVE_UP_PAGES", 2)
+    text, complete = scraper.extract_pdf_text(BytesIO(make_pdf(["Pre-K update"] + LATE_HIT)))
+    assert complete
+    assert "Preschool expansion" in text
+
+
+def test_pdf_give_up_disabled_reads_everything(parsed_cache, make_pdf):
+    text, complete = scraper.extract_pdf_text(BytesIO(make_pdf(LATE_HIT)))
+    assert complete
+    assert "Preschool expansion" in text
@@ -0,0 +1,115 @@
+import pytest
+
+import scraper
+from scraper import LinkItem, boarddocs_json_files, canonical_url
+
+FILE_A = "https://go.boarddocs.com/nj/delranschools/Board.nsf/files/ABC123/$file/a.pdf"
+FILE_B = "https://go.boarddocs.com/nj/delranschools/Board.nsf/files/DEF456/$file/b.pdf"
+
+
+def test_boarddocs_json_pairs_each_url_with_its_own_name():
+    script = (
+        'var files = [{"fileName": "Minutes Jan.pdf", "downloadUrl": "%s"},'
+        ' {"downloadUrl": "%s", "fileName": "Agenda Feb.pdf"}];' % (FILE_A, FILE_B)
+    )
+    assert list(boarddocs_json_files(script)) == [(FILE_A, "Minutes Jan.pdf"), (FILE_B, "Agenda Feb.pdf")]
+
+
+def test_boarddocs_json_nested_object_keeps_the_pair():
+    script = (
+        '[{"downloadUrl": "%s", "meta": {"size": 12, "tags": {"a": 1}}, "fileName": "Minutes.pdf"},'
+        ' {"downloadUrl": "%s"}]' % (FILE_A, FILE_B)
+    )
+    assert list(boarddocs_json_files(script)) == [(FILE_A, "Minutes.pdf"), (FILE_B, None)]
+
+
+def test_boarddocs_json_skips_scripts_without_file_urls():
+    assert list(boarddocs_json_files('{"fileName": "x.pdf", "downloadUrl": "/other/x.pdf"}')) == []
+
+
+def test_previously_reported_boarddocs_url_counts_as_seen():
+    # Reported under the old title (the script's first fileName)
+    state = {"seen_hashes": {scraper.digest_of(FILE_B, "Minutes Jan.pdf"): None},
+             "seen_urls": {FILE_B: None}}
+    link = LinkItem("Agenda Feb.pdf", FILE_B, "boarddocs")
+    assert scraper.is_seen(link.url, link.title, state, link.source)
+    # District links still need their own fingerprint
+    assert not scraper.is_seen(FILE_B, "Agenda Feb.pdf", state, "district")
+
+
+def _anchor(html):
+    tree = scraper.parse_html(b"<html><body>" + html + b"</body></html>")
+    return tree.xpath("//a")[0]
+
+
+def test_anchor_title_matches_legacy_get_text_form():
+    # BeautifulSoup's get_text(strip=True), which the stored fingerprints were built from
+    assert scraper.anchor_text(_anchor(b'<a href="/m.pdf"> Board <b>Minutes</b>\n 2024 </a>')) == "BoardMinutes2024"
+    assert scraper.anchor_text(_anchor(b'<a href="/m.pdf">Regular<!-- x --> <br> Meeting</a>')) == "RegularMeeting"
+
+
+def test_collected_links_use_anchor_title():
+    tree = scraper.parse_html(
+        b'<html><body><a href="/docs/GetFile.ashx?id=1"> Regular <b>Meeting</b> Minutes </a></body></html>'
+    )
+    (link,) = scraper.collect_links_from_tree("https://www.delranschools.org/b_o_e", tree)
+    assert link == LinkItem("RegularMeetingMinutes", "https://www.delranschools.org/docs/GetFile.ashx?id=1", "district")
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://WWW.Delranschools.org/b_o_e", "https://www.delranschools.org/b_o_e"),
+    ("https://www.delranschools.org:443/a.pdf", "https://www.delranschools.org/a.pdf"),
+    ("http://example.org:80/a", "http://example.org/a"),
+    ("https://example.org:8443/a", "https://example.org:8443/a"),
+    ("https://example.org/a#section", "https://example.org/a"),
+    ("https://example.org", "https://example.org/"),
+    ("https://example.org/f.ashx?b=2&a=1&empty=", "https://example.org/f.ashx?a=1&b=2"),
+    ("https://example.org/Board.nsf/Files/ABC", "https://example.org/Board.nsf/Files/ABC"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_dedupe_links_keeps_first_of_each_canonical_url():
+    a = LinkItem("Minutes", "https://example.org/f.ashx?id=1&x=2", "district")
+    b = LinkItem("Minutes (copy)", "https://EXAMPLE.org/f.ashx?x=2&id=1#top", "district")
+    c = LinkItem("Agenda", "https://example.org/f.ashx?id=2", "district")
+    assert scraper.dedupe_links([a, b, c]) == [a, c]
+
+
+ROWS_PAGE = b"""<html><body><table>
+<tr><td>Regular Meeting Minutes - March 3, 2024</td><td><a href="/docs/0303.pdf">Download</a></td></tr>
+<tr><td>Transportation Handbook</td><td><a href="/docs/bus.pdf">Download</a></td></tr>
+</table>
+<ul><li>Special Meeting <a href="/docs/special.docx">View</a></li></ul>
+<a href="/docs/loose.pdf">Download</a>
+</body></html>"""
+
+
+def test_row_context_titles_generic_document_links():
+    tree = scraper.parse_html(ROWS_PAGE)
+    links = scraper.collect_links_from_tree("https://www.delranschools.org/b_o_e", tree)
+    assert [(link.title, link.url) for link in links] == [
+        ("Regular Meeting Minutes - March 3, 2024 Download", "https://www.delranschools.org/docs/0303.pdf"),
+        ("Special Meeting View", "https://www.delranschools.org/docs/special.docx"),
+    ]
+
+
+def test_row_context_is_empty_outside_rows_and_list_items():
+    tree = scraper.parse_html(ROWS_PAGE)
+    loose = tree.xpath("//a[@href='/docs/loose.pdf']")[0]
+    assert scraper.row_context(loose) == ""
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.delranschools.org/b_o_e", True),
+    ("https://DelranSchools.org/x", True),
+    ("https://cdnsm5-ss5.sharpschool.com/userfiles/minutes.pdf", True),
+    ("https://files.delranschools.org/m.pdf", True),  # subdomains of an allowed host
+    ("https://evildelranschools.org/m.pdf", False),
+    ("https://delranschools.org.example.com/m.pdf", False),
+    ("https://go.boarddocs.com/nj/delranschools/Board.nsf/Public", False),
+])
+def test_is_allowed_domain(url, expected):
+    assert scraper.is_allowed_domain(url, scraper.ALLOWED_DISTRICT_DOMAINS) is expected
+    assert scraper.is_allowed_domain(url, set(scraper.ALLOWED_DISTRICT_DOMAINS)) is expected
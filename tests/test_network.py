@@ -0,0 +1,141 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import scraper
+
+ROBOTS = """User-agent: *
+Disallow: /private/
+Crawl-delay: 5
+"""
+
+
+class StubResponse:
+    def __init__(self, status_code=200, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def robots(monkeypatch):
+    """Serve robots.txt per host from a dict; records which hosts were asked."""
+    served, asked = {}, []
+
+    def fake_get(url, timeout=None, **kwargs):
+        host = url.split("/")[2]
+        asked.append(host)
+        if host not in served:
+            raise OSError("connection refused")
+        return served[host]
+
+    monkeypatch.setattr(scraper._SESSION, "get", fake_get)
+    monkeypatch.setattr(scraper, "RESPECT_ROBOTS", True)
+    monkeypatch.setattr(scraper, "_ROBOTS", {})
+    monkeypatch.setattr(scraper, "_ROBOTS_LOCKS", {})
+    monkeypatch.setattr(scraper, "_LAST_HIT", {})
+    return served, asked
+
+
+def test_robots_rules_are_fetched_once_per_host(robots):
+    served, asked = robots
+    served["example.org"] = StubResponse(text=ROBOTS)
+    assert not scraper.can_fetch("https://example.org/private/minutes.pdf")
+    assert scraper.can_fetch("https://example.org/public/minutes.pdf")
+    assert asked == ["example.org"]
+
+
+def test_unreachable_or_missing_robots_allows_everything(robots):
+    served, _ = robots
+    served["missing.example"] = StubResponse(status_code=404)
+    assert scraper.can_fetch("https://missing.example/private/x.pdf")
+    assert scraper.can_fetch("https://down.example/private/x.pdf")
+
+
+def test_robots_ignored_when_disabled(robots, monkeypatch):
+    _, asked = robots
+    monkeypatch.setattr(scraper, "RESPECT_ROBOTS", False)
+    assert scraper.can_fetch("https://example.org/private/x.pdf")
+    assert asked == []
+
+
+def test_slow_robots_fetch_only_blocks_its_own_host(robots, monkeypatch):
+    served, _ = robots
+    served["fast.example"] = StubResponse(status_code=404)
+    release = threading.Event()
+    original_get = scraper._SESSION.get
+
+    def slow_get(url, timeout=None, **kwargs):
+        if "slow.example" in url:
+            release.wait(5)
+            return StubResponse(status_code=404)
+        return original_get(url, timeout=timeout)
+
+    monkeypatch.setattr(scraper._SESSION, "get", slow_get)
+    t = threading.Thread(target=scraper.robots_for, args=("slow.example",))
+    t.start()
+    try:
+        start = time.monotonic()
+        scraper.robots_for("fast.example")
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+        t.join()
+
+
+def test_polite_delay_uses_crawl_delay_per_host(robots, monkeypatch):
+    served, _ = robots
+    served["example.org"] = StubResponse(text=ROBOTS)
+    served["other.example"] = StubResponse(status_code=404)
+    monkeypatch.setattr(scraper, "DOC_DELAY_SECONDS", 1.0)
+    waits = []
+    monkeypatch.setattr(scraper.time, "sleep", waits.append)
+
+    scraper.polite_delay("https://example.org/a.pdf")
+    scraper.polite_delay("https://other.example/a.pdf")
+    assert waits == []  # first request to each host goes straight out
+
+    scraper.polite_delay("https://example.org/b.pdf")
+    scraper.polite_delay("https://other.example/b.pdf")
+    assert len(waits) == 2
+    assert 4 < waits[0] <= 5  # robots.txt Crawl-delay beats DOC_DELAY_SECONDS
+    assert 0 < waits[1] <= 1
+
+
+def test_dns_cache_is_not_installed_on_import():
+    assert getattr(socket.getaddrinfo, "__module__", None) != "scraper"
+
+
+def test_dns_cache_memoizes_until_restored(monkeypatch):
+    calls = []
+
+    def fake_getaddrinfo(host, port, *args, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    restore = scraper.install_dns_cache()
+    try:
+        first = socket.getaddrinfo("example.org", 443)
+        second = socket.getaddrinfo("example.org", 443)
+        socket.getaddrinfo("example.net", 443)
+    finally:
+        restore()
+
+    assert calls == ["example.org", "example.net"]
+    assert first == second and first is not second
+    assert socket.getaddrinfo is fake_getaddrinfo
+
+
+def test_dns_cache_entries_expire(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socket, "getaddrinfo", lambda *a, **k: calls.append(a) or [])
+    monkeypatch.setattr(scraper, "DNS_CACHE_TTL", 0)
+    restore = scraper.install_dns_cache()
+    try:
+        socket.getaddrinfo("example.org", 443)
+        socket.getaddrinfo("example.org", 443)
+    finally:
+        restore()
+    assert len(calls) == 2
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from dateutil import parser as dateparser
+
+import parser_utils
+
+
+def _broken_engine(stream):
+    raise RuntimeError("cannot open")
+    yield  # pragma: no cover
+
+
+def _text_engine(stream):
+    assert stream.read(5) == b"%PDF-"
+    yield "page one"
+    yield ""
+    yield "page three"
+
+
+def test_pdf_engine_falls_back_to_next_engine(monkeypatch):
+    monkeypatch.setattr(parser_utils, "_PDF_ENGINES", (_broken_engine, _text_engine))
+    assert list(parser_utils.extract_text_from_pdf_pages(b"%PDF-1.4 ...")) == ["page one", "", "page three"]
+    assert parser_utils.extract_text_from_pdf(b"%PDF-1.4 ...") == "page one\npage three"
+
+
+def test_pdf_with_no_readable_engine_yields_nothing(monkeypatch):
+    monkeypatch.setattr(parser_utils, "_PDF_ENGINES", (_broken_engine,))
+    assert parser_utils.extract_text_from_pdf(b"%PDF-1.4 ...") == ""
+
+
+def test_pdf_text_extraction(make_pdf):
+    pdf = make_pdf(["Board of Education", "Preschool expansion"])
+    pages = list(parser_utils.extract_text_from_pdf_pages(pdf))
+    assert [p.strip() for p in pages] == ["Board of Education", "Preschool expansion"]
+
+
+def test_concurrent_pdf_extraction(make_pdf):
+    # Documents are extracted on the scraper's worker pool
+    docs = [make_pdf([f"Document {d} page {p}" for p in range(5)]) for d in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        texts = list(ex.map(parser_utils.extract_text_from_pdf, docs * 4))
+    for d, text in enumerate(texts):
+        assert text.split("\n")[0].strip() == f"Document {d % 16} page 0"
+        assert "page 4" in text
+
+
+@pytest.mark.parametrize("token", [
+    "March 3, 2024",
+    "Sept 12, 2023",
+    "Dec. 1, 2022",
+    "3/4/2024",
+    "03/04/24",
+    "2024-05-14",
+    "20240514",
+    "2024/05/14",
+])
+def test_fast_date_parser_matches_dateutil(token):
+    assert parser_utils._fast_parse_date(token) == dateparser.parse(token, dayfirst=False, fuzzy=True)
+
+
+def test_fast_date_parser_reads_underscored_url_dates():
+    # dateutil's fuzzy mode drops the year here (2024_5_14 -> May 14 of the
+    # current year); the fast path reads it the way URL dates are written
+    assert parser_utils._fast_parse_date("2024_5_14") == datetime(2024, 5, 14)
+
+
+@pytest.mark.parametrize("token", [
+    "2/30/2024",
+    "Foo 3, 2024",
+    "13/01/2024",
+    # Ambiguous digit runs and mixed separators are left to dateutil
+    "202311",
+    "2023125",
+    "2023-0504",
+])
+def test_fast_date_parser_leaves_other_tokens_to_dateutil(token):
+    assert parser_utils._fast_parse_date(token) is None
+
+
+def test_guess_date_from_url_or_title():
+    url = "https://www.delranschools.org/docs/2023-06-20-regular.pdf"
+    assert parser_utils.guess_date_from_url_or_title(url, "Regular Meeting") == datetime(2023, 6, 20)
+    assert parser_utils.guess_date_from_url_or_title("https://example.org/minutes.pdf", "Minutes") is None
@@ -0,0 +1,103 @@
+from io import BytesIO
+
+import pytest
+
+import scraper
+from scraper import LinkItem
+
+URL = "https://www.delranschools.org/docs/minutes.html"
+LINK = LinkItem("Regular Meeting Minutes", URL, "district")
+PAGE = b"<html><body><p>Regular Meeting, March 3, 2024. Pre-K lottery update.</p></body></html>"
+
+
+class StubResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Stub the network side of process_document(); records the validators it was sent."""
+    calls = []
+    response = {"resp": StubResponse(headers={"ETag": '"v2"'}), "body": PAGE}
+
+    def fake_fetch_document(url, validators=None):
+        calls.append(validators)
+        return response["resp"], BytesIO(response["body"])
+
+    monkeypatch.setattr(scraper, "fetch_document", fake_fetch_document)
+    monkeypatch.setattr(scraper, "can_fetch", lambda url: True)
+    monkeypatch.setattr(scraper, "polite_delay", lambda url: None)
+    monkeypatch.setattr(scraper, "FORCE_FULL_RESCAN", False)
+    monkeypatch.setattr(scraper, "IGNORE_DEDUPE", False)
+    monkeypatch.setattr(scraper, "MIN_YEAR", None)
+    return calls, response
+
+
+def _state(validators=None):
+    return {"seen_hashes": {}, "seen_urls": {}, "validators": dict(validators or {})}
+
+
+def test_stored_validators_are_sent(fetched):
+    calls, _ = fetched
+    scraper.process_document(LINK, _state({URL: ['"v1"', "Mon, 01 Jan 2024 00:00:00 GMT"]}))
+    assert calls == [['"v1"', "Mon, 01 Jan 2024 00:00:00 GMT"]]
+
+
+def test_not_modified_is_skipped(fetched):
+    calls, response = fetched
+    response["resp"], response["body"] = StubResponse(status_code=304), b""
+
+    assert scraper.process_document(LINK, _state({URL: ['"v1"', None]})) == (None, None)
+    assert calls == [['"v1"', None]]
+
+
+def test_ignore_dedupe_downloads_unconditionally(fetched, monkeypatch):
+    calls, _ = fetched
+    monkeypatch.setattr(scraper, "IGNORE_DEDUPE", True)
+
+    result, _ = scraper.process_document(LINK, _state({URL: ['"v1"', None]}))
+    assert result is not None
+    assert calls == [None]
+
+
+def test_min_year_skips_dated_links_before_fetching(fetched, monkeypatch):
+    calls, _ = fetched
+    monkeypatch.setattr(scraper, "MIN_YEAR", 2020)
+    old = LinkItem("Regular Meeting", "https://www.delranschools.org/docs/2019-05-14-regular.html", "district")
+
+    assert scraper.process_document(old, _state()) == (None, None)
+    assert calls == []
+
+
+def test_min_year_still_fetches_undated_links(fetched, monkeypatch):
+    calls, _ = fetched
+    monkeypatch.setattr(scraper, "MIN_YEAR", 2020)
+
+    result, _ = scraper.process_document(LINK, _state())
+    assert result["date"] == "2024-03-03"
+    assert calls == [None]
+
+
+def test_returns_match_and_validators_without_writing_state(fetched):
+    state = _state()
+    result, validators = scraper.process_document(LINK, state)
+
+    assert result["url"] == URL
+    assert validators == ['"v2"', None]
+    assert state == _state()
+
+
+def test_validators_are_returned_without_a_match(fetched):
+    _, response = fetched
+    response["body"] = b"<html><body><p>Budget hearing.</p></body></html>"
+    assert scraper.process_document(LINK, _state()) == (None, ['"v2"', None])
+
+
+def test_html_served_as_pdf_is_rejected(fetched):
+    _, response = fetched
+    response["body"] = b"<html><body>Checking your browser... Pre-K</body></html>"
+    pdf_link = LinkItem("Regular Meeting Minutes", "https://www.delranschools.org/docs/minutes.pdf", "district")
+    # No validators either, so the real file is fetched in full next time
+    assert scraper.process_document(pdf_link, _state()) == (None, None)
@@ -0,0 +1,125 @@
+import json
+
+import scraper
+from scraper import LinkItem
+
+
+def _link(n, title="Regular Meeting Minutes"):
+    return LinkItem(title, f"https://www.delranschools.org/docs/{n}.pdf", "district")
+
+
+def _result(link):
+    return {"url": link.url, "title": link.title, "date": "", "mentions": []}
+
+
+def _journal_records(journal):
+    return [json.loads(line) for line in journal.read_bytes().splitlines()]
+
+
+def test_checkpoint_journal_roundtrip(state_paths):
+    state_file, journal = state_paths
+    state = scraper.load_state()
+    link = _link(1)
+    scraper.mark_seen(link, state)
+    scraper.remember_validators(link.url, ['"etag-1"', None], state)
+    state["pending_results"] = [_result(link)]
+    scraper.save_state(state, checkpoint=True)
+
+    assert journal.exists()
+    assert not state_file.exists()
+
+    reloaded = scraper.load_state()
+    assert scraper.is_seen(link.url, link.title, reloaded)
+    assert link.url in reloaded["seen_urls"]
+    assert reloaded["validators"][link.url] == ['"etag-1"', None]
+    assert reloaded["pending_results"] == [_result(link)]
+
+
+def test_checkpoint_appends_only_new_entries(state_paths):
+    _, journal = state_paths
+    state = scraper.load_state()
+    state["pending_results"] = []
+    for n in (1, 2):
+        scraper.mark_seen(_link(n), state)
+        state["pending_results"].append(_result(_link(n)))
+        scraper.save_state(state, checkpoint=True)
+
+    first, second = _journal_records(journal)
+    assert first["seen_urls"] == [_link(1).url]
+    assert second["seen_urls"] == [_link(2).url]
+    assert second["pending_results"] == [_result(_link(2))]
+
+    reloaded = scraper.load_state()
+    assert reloaded["pending_results"] == [_result(_link(1)), _result(_link(2))]
+
+
+def test_final_save_folds_journal_into_state_file(state_paths):
+    state_file, journal = state_paths
+    state = scraper.load_state()
+    scraper.mark_seen(_link(1), state)
+    scraper.save_state(state, checkpoint=True)
+    scraper.mark_seen(_link(2), state)
+    state.pop("pending_results", None)
+    scraper.save_state(state)
+
+    assert not journal.exists()
+    saved = json.loads(state_file.read_bytes())
+    assert saved["seen_urls"] == [_link(1).url, _link(2).url]
+    assert saved["last_run_end"]
+
+
+def test_replay_ignores_torn_last_line(state_paths):
+    _, journal = state_paths
+    state = scraper.load_state()
+    scraper.mark_seen(_link(1), state)
+    scraper.save_state(state, checkpoint=True)
+    with open(journal, "ab") as f:
+        f.write(b'{"seen_hashes": ["abc')
+
+    reloaded = scraper.load_state()
+    assert list(reloaded["seen_urls"]) == [_link(1).url]
+
+
+def test_forced_rescan_discards_stale_journal(state_paths, monkeypatch):
+    _, journal = state_paths
+    state = scraper.load_state()
+    scraper.mark_seen(_link(1), state)
+    scraper.save_state(state, checkpoint=True)
+
+    monkeypatch.setattr(scraper, "FORCE_FULL_RESCAN", True)
+    forced = scraper.load_state()
+    assert not journal.exists()
+    scraper.mark_seen(_link(2), forced)
+    scraper.save_state(forced, checkpoint=True)
+
+    (only,) = _journal_records(journal)
+    assert only["seen_urls"] == [_link(2).url]
+
+
+def test_legacy_sha1_fingerprints_are_upgraded(state_paths):
+    state_file, _ = state_paths
+    link = _link(1)
+    state_file.write_text(json.dumps({
+        "seen_hashes": [scraper.sha1_of(link.url, link.title)],
+        "seen_urls": [link.url],
+    }))
+
+    state = scraper.load_state()
+    assert state["legacy_sha1"] is True
+    assert scraper.is_seen(link.url, link.title, state)
+
+    scraper.upgrade_legacy_fingerprints([link, _link(2)], state)
+    assert scraper.digest_of(link.url, link.title) in state["seen_hashes"]
+    assert scraper.digest_of(_link(2).url, _link(2).title) not in state["seen_hashes"]
+
+
+def test_legacy_flag_is_not_saved(state_paths):
+    state_file, _ = state_paths
+    state_file.write_text(json.dumps({"seen_hashes": [scraper.sha1_of("u", "t")], "seen_urls": ["u"]}))
+    state = scraper.load_state()
+    assert state["legacy_sha1"] is True
+
+    scraper.save_state(state)
+    saved = json.loads(state_file.read_bytes())
+    assert "legacy_sha1" not in saved
+    assert scraper.load_state()["legacy_sha1"] is True  # recomputed from the hashes